@@ -12,6 +12,7 @@ This is the COMPREHENSIVE system - best of both approaches.
 """
 
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any, Dict, List, Optional, Protocol, Callable, Set, Tuple
@@ -196,17 +197,17 @@ class TaskTree:
         - Batch submission to TaskRouter
         """
         tasks: List[Task] = []
-        queue: List[Tuple[TaskTree, int, float]] = [(self, start_tick, start_scene_time)]
+        # deque: popleft is O(1), list.pop(0) shifts the whole queue
+        queue: deque[Tuple[TaskTree, int, float]] = deque([(self, start_tick, start_scene_time)])
         
         while queue:
-            node, t_id, t_time = queue.pop(0)
+            node, t_id, t_time = queue.popleft()
             tasks.append(node.to_task(t_id, t_time))
             
-            # Enqueue children
+            # Enqueue children (whole sibling run at once)
             child_tick = t_id + 1
             child_time = t_time + dt_per_step
-            for child in node.steps:
-                queue.append((child, child_tick, child_time))
+            queue.extend((child, child_tick, child_time) for child in node.steps)
         
         return tasks
 
@@ -9,6 +9,29 @@ Behavior3D Deep Contract Layer
 from dataclasses import dataclass
 from behavior3d_mr import BehaviorState, update_behavior_mr
 
+# Event bits evaluated once per step (AP alerts + delta triggers)
+EVT_INTENT_SPIKE = 1   # intent grew > 0.25 in one step
+EVT_THREAT_HIGH = 2    # threat rising and above 0.8
+EVT_HIGH_INTENT = 4    # intent > 0.7 -> navigation request
+EVT_ALERT_FOCUS = 8    # alertness > 0.6 -> perception focus
+
+
+def behavior_events(prev: BehaviorState, new: BehaviorState) -> int:
+    """Evaluate all step thresholds in a single pass, return event bitmask."""
+    intent = new.intent
+    threat = new.threat
+    events = 0
+    if (intent - prev.intent) > 0.25:
+        events |= EVT_INTENT_SPIKE
+    if threat > prev.threat and threat > 0.8:
+        events |= EVT_THREAT_HIGH
+    if intent > 0.7:
+        events |= EVT_HIGH_INTENT
+    if new.alertness > 0.6:
+        events |= EVT_ALERT_FOCUS
+    return events
+
+
 @dataclass
 class BehaviorDelta:
     domain: str
@@ -35,14 +58,17 @@ class Behavior3DContract:
     # AP Constraints
     # ---------------------------
     def ap_check(self, prev: BehaviorState, new: BehaviorState):
+        return self._alerts_from_events(new, behavior_events(prev, new))
+
+    def _alerts_from_events(self, new: BehaviorState, events: int):
         alerts = []
 
         # Alert: intent grows too fast
-        if (new.intent - prev.intent) > 0.25:
+        if events & EVT_INTENT_SPIKE:
             alerts.append(("behavior3d/intent_spike", new.intent))
 
         # Alert: threat cannot jump if no LOS
-        if new.threat > prev.threat and new.threat > 0.8:
+        if events & EVT_THREAT_HIGH:
             alerts.append(("behavior3d/threat_high", new.threat))
 
         return alerts
@@ -51,10 +77,13 @@ class Behavior3DContract:
     # Delta creation
     # ---------------------------
     def derive_deltas(self, aid: str, prev: BehaviorState, new: BehaviorState):
+        return self._deltas_from_events(aid, behavior_events(prev, new))
+
+    def _deltas_from_events(self, aid: str, events: int):
         deltas = []
 
         # High intent triggers navigation path request
-        if new.intent > 0.7:
+        if events & EVT_HIGH_INTENT:
             deltas.append(BehaviorDelta(
                 domain="behavior3d",
                 type="navigation3d/request_path",
@@ -63,7 +92,7 @@ class Behavior3DContract:
             ))
 
         # High alertness triggers perception focus
-        if new.alertness > 0.6:
+        if events & EVT_ALERT_FOCUS:
             deltas.append(BehaviorDelta(
                 domain="behavior3d",
                 type="perception3d/focus",
@@ -79,9 +108,13 @@ class Behavior3DContract:
     def step(self, agent_id, spatial_slice, perception_slice, nav_slice):
         prev = self.state[agent_id]
         new = update_behavior_mr(prev, spatial_slice, perception_slice, nav_slice)
+        self.state[agent_id] = new
 
-        alerts = self.ap_check(prev, new)
-        deltas = self.derive_deltas(agent_id, prev, new)
+        # One pass over the state fields; most ticks fire nothing
+        events = behavior_events(prev, new)
+        if not events:
+            return [], []
 
-        self.state[agent_id] = new
+        alerts = self._alerts_from_events(new, events)
+        deltas = self._deltas_from_events(agent_id, events)
         return deltas, alerts
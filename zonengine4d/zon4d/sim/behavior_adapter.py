@@ -6,7 +6,9 @@ Wraps behavior_mr kernel with state management and AP validation.
 Integrates Spatial3D, Perception3D, Navigation3D into unified AI agent.
 """
 
+import sys
 import time
+from concurrent.futures import Executor
 from typing import Dict, List, Tuple, Optional, Any
 
 # Import base classes
@@ -14,6 +16,8 @@ try:
     from sim_imports import Alert, BaseStateView, Delta
 except ImportError:
     class Alert:
+        __slots__ = ('level', 'step', 'message', 'tick', 'ts', 'payload')
+        
         def __init__(self, level, step, message, tick, ts, payload=None):
             self.level = level
             self.step = step
@@ -30,6 +34,8 @@ except ImportError:
             return self._state_slice
     
     class Delta:
+        __slots__ = ('id', 'type', 'payload', 'tags', 'priority')
+        
         def __init__(self, id, type, payload, tags=None, priority=0):
             self.id = id
             self.type = type
@@ -39,17 +45,85 @@ except ImportError:
 
 # Import mr kernel
 from behavior_mr import (
-    step_behavior, BehaviorState, BehaviorConfig, EntityState,
-    PerceptionInput, BehaviorStateType, BehaviorAction
+    step_behavior, step_behavior_batch, BehaviorState, BehaviorConfig, EntityState,
+    PerceptionInput, BehaviorStateType, BehaviorAction,
+    is_dormant, advance_dormant, tag_bits
 )
 
+# Interned delta types / alert levels shared by every emitted Delta and Alert
+_TYPE_REQUEST_PATH = sys.intern("navigation3d/request_path")
+_TYPE_ATTACK = sys.intern("behavior3d/attack")
+_LEVEL_ERROR = sys.intern("ERROR")
+
+# Shared input for entities with no perception memories (frozen, never mutated)
+_EMPTY_PERCEPTION = PerceptionInput()
+
+# Stored value -> enum member; a dict hit is much cheaper than the
+# BehaviorStateType(value) constructor on every load
+_STATE_BY_VALUE = {s.value: s for s in BehaviorStateType}
+
+
+# ============================================================
+# ACTION → DELTA BUILDERS
+# ============================================================
+
+def _move_to_delta(action: BehaviorAction, delta_id: str, tick: float, positions: Dict[str, list]) -> Delta:
+    """Request path from Navigation3D."""
+    return Delta(
+        id=delta_id,
+        type=_TYPE_REQUEST_PATH,
+        payload={
+            "entity_id": action.entity_id,
+            "start": positions[action.entity_id] if action.entity_id in positions else [0,0,0],
+            "goal": list(action.target_position) if action.target_position else [0,0,0],
+            "tick": tick
+        },
+        tags=["behavior"]
+    )
+
+
+def _attack_delta(action: BehaviorAction, delta_id: str, tick: float, positions: Dict[str, list]) -> Delta:
+    """Emit attack delta (for future Combat3D)."""
+    return Delta(
+        id=delta_id,
+        type=_TYPE_ATTACK,
+        payload={
+            "attacker": action.entity_id,
+            "target": action.target_entity
+        },
+        tags=["behavior", "combat"]
+    )
+
+
+def _patrol_delta(action: BehaviorAction, delta_id: str, tick: float, positions: Dict[str, list]) -> Delta:
+    """Request path to patrol point."""
+    return Delta(
+        id=delta_id,
+        type=_TYPE_REQUEST_PATH,
+        payload={
+            "entity_id": action.entity_id,
+            "start": positions[action.entity_id] if action.entity_id in positions else [0,0,0],
+            "goal": list(action.target_position) if action.target_position else [0,0,0],
+            "tick": tick
+        },
+        tags=["behavior", "patrol"]
+    )
+
+
+# Dispatch table keyed by BehaviorAction.action_type ("wait" needs no delta)
+_DELTA_BUILDERS = {
+    "move_to": _move_to_delta,
+    "attack": _attack_delta,
+    "patrol": _patrol_delta,
+}
+
 
 class BehaviorStateView(BaseStateView):
     """Adapter for Behavior3D subsystem."""
     
     DOMAIN = "behavior3d"
     
-    def __init__(self, state_slice: dict = None):
+    def __init__(self, state_slice: dict = None, executor: Optional[Executor] = None):
         if state_slice is None:
             state_slice = {
                 "entities": {},
@@ -64,6 +138,53 @@ class BehaviorStateView(BaseStateView):
         self._perception_snapshot = {}
         self._navigation_snapshot = {}
         self._delta_counter = 0
+        
+        # Optional executor for the per-entity kernel pass. Only useful when
+        # the kernel can run without the GIL (e.g. free-threaded builds).
+        self._executor = executor
+        
+        # (tick, positions, actions) from behavior_decide awaiting behavior_emit
+        self._pending: Optional[Tuple[float, Dict[str, list], List[BehaviorAction]]] = None
+        
+        # Spatial snapshot converted once per ingest (entity_id -> EntityState)
+        self._entity_states: Dict[str, EntityState] = {}
+        # entity_id -> stored "pos" list, for path-request deltas
+        self._positions: Dict[str, list] = {}
+        
+        # entity_id -> tag bitmask from the spatial snapshot; PerceptionInput
+        # carries these for visible entities (enemy classification)
+        self._tag_bits: Dict[str, int] = {}
+        
+        # Static patrol routes: entity_id -> (stored list, kernel tuple form)
+        self._patrol_points: Dict[str, Tuple[list, tuple]] = {}
+        
+        # Kernel states newer than the stored slice dicts (entity_id ->
+        # BehaviorState); materialized by save_to_state/get_behavior_state
+        self._live_states: Dict[str, BehaviorState] = {}
+        
+        # Step plan: ((entity_id, EntityState), ...) for behavior entities
+        # present in the spatial snapshot, rebuilt when either side changes
+        self._step_plan: Tuple[Tuple[str, EntityState], ...] = ()
+        self._step_plan_key: Tuple[Tuple[str, ...], Optional[dict]] = ((), None)
+        
+        # Output buffers reused every tick (cleared, not rebound)
+        self._deltas_buf: List[Delta] = []
+        self._alerts_buf: List[Alert] = []
+    
+    # ========================================
+    # STATE SNAPSHOTS
+    # ========================================
+    
+    def save_to_state(self) -> dict:
+        """Materialize live behavior states into the slice and return it."""
+        self._flush_live_states()
+        return super().save_to_state()
+    
+    def load_from_state(self, state_slice: dict):
+        """Replace the behavior slice; live states and pending actions from the old one are dropped."""
+        self._live_states.clear()
+        self._pending = None
+        self._state_slice = state_slice
     
     # ========================================
     # INPUT LOADING
@@ -72,6 +193,27 @@ class BehaviorStateView(BaseStateView):
     def set_spatial_state(self, spatial_snapshot: dict):
         """Load spatial state for behavior decisions."""
         self._spatial_snapshot = spatial_snapshot
+        
+        # Build kernel inputs once here instead of per entity per step
+        self._entity_states = {
+            entity_id: EntityState(
+                position=tuple(spatial_entity.get("pos", [0, 0, 0])),
+                health=spatial_entity.get("health", 1.0),
+                tags=tuple(spatial_entity.get("tags", [])),
+                tag_bits=tag_bits(spatial_entity.get("tags", ()))
+            )
+            for entity_id, spatial_entity in spatial_snapshot.get("entities", {}).items()
+        }
+        self._positions = {
+            entity_id: spatial_entity["pos"]
+            for entity_id, spatial_entity in spatial_snapshot.get("entities", {}).items()
+            if "pos" in spatial_entity
+        }
+        
+        self._tag_bits = {
+            entity_id: entity_state.tag_bits
+            for entity_id, entity_state in self._entity_states.items()
+        }
     
     def set_perception_state(self, perception_snapshot: dict):
         """Load perception state."""
@@ -86,67 +228,197 @@ class BehaviorStateView(BaseStateView):
     # ========================================
     
     def behavior_step(self, current_tick: float, delta_time: float) -> Tuple[List[Delta], List[Alert]]:
-        """Execute behavior AI for all entities."""
-        deltas = []
-        alerts = []
+        """
+        Execute behavior AI for all entities (decide + emit in one call).
         
-        # Get spatial entities
-        spatial_entities = self._spatial_snapshot.get("entities", {})
+        The returned lists are reused on the next step; copy them to keep
+        them across ticks.
+        """
+        alerts = self.behavior_decide(current_tick, delta_time)
+        deltas = self.behavior_emit()
+        return deltas, alerts
+    
+    def behavior_decide(self, current_tick: float, delta_time: float) -> List[Alert]:
+        """
+        Stage 1: run the FSM for all entities and commit new behavior states.
+        
+        Pure compute over the loaded snapshots. Once this returns, behavior
+        states are final for the tick, so peer subsystems that read them
+        (via save_to_state/get_behavior_state) can start their own stage
+        while behavior_emit() is pending. New states stay live in kernel
+        form until one of those calls materializes them.
+        
+        The returned list is a buffer cleared on the next call.
+        """
+        alerts = self._alerts_buf
+        alerts.clear()
         
-        # Process each entity with behavior
-        for entity_id, behavior_data in list(self._state_slice.get("entities", {}).items()):
-            # Get spatial state
-            if entity_id not in spatial_entities:
+        entities = self._state_slice.get("entities", {})
+        
+        # Gather kernel inputs for each entity with behavior. slots keeps
+        # entity order: (entity_id, None) for kernel jobs, or (entity_id,
+        # actions) for entities resolved without the kernel
+        jobs = []
+        slots = []
+        live_states = self._live_states
+        for entity_id, entity_state in self._get_step_plan(entities):
+            # Live kernel state if this entity has stepped since the last
+            # flush, otherwise parse the stored dict
+            behavior_state = live_states.get(entity_id)
+            behavior_data = entities[entity_id] if behavior_state is None else None
+            
+            # Early check for the common bad inputs; anything it misses is
+            # still caught around the kernel call
+            problem = self._validate_kernel_inputs(entity_state, behavior_data)
+            if problem:
+                alerts.append(Alert(
+                    level=_LEVEL_ERROR,
+                    step="behavior_kernel",
+                    message=f"Behavior error for {entity_id}: {problem}",
+                    tick=current_tick,
+                    ts=time.time()
+                ))
                 continue
             
-            spatial_entity = spatial_entities[entity_id]
-            entity_state = EntityState(
-                position=tuple(spatial_entity.get("pos", [0, 0, 0])),
-                health=spatial_entity.get("health", 1.0),
-                tags=tuple(spatial_entity.get("tags", []))
-            )
+            if behavior_state is None:
+                behavior_state = self._load_behavior_state(entity_id, behavior_data)
             
-            # Get perception input
             perception_input = self._build_perception_input(entity_id)
             
-            # Get current behavior state
-            behavior_state = self._load_behavior_state(entity_id, behavior_data)
+            # Hot-path skip: a dormant entity only ages its timers, so
+            # advance its adapter-owned live state in place here instead
+            # of queuing a kernel job
+            if is_dormant(behavior_state, perception_input):
+                live_states[entity_id] = behavior_state
+                slots.append((entity_id, advance_dormant(behavior_state, delta_time)))
+                continue
+            
+            slots.append((entity_id, None))
+            jobs.append((behavior_state, entity_state, perception_input))
+        
+        # Kernel pass: entities are independent (no shared writes), so this
+        # can fan out over the executor; results come back in job order
+        config = self._config
+        
+        if self._executor is not None and len(jobs) > 1:
+            # Kernel failures become per-entity alerts below
+            def run_kernel(job):
+                try:
+                    return step_behavior(*job, config, current_tick, delta_time)
+                except Exception as e:
+                    return e
             
-            # Call mr kernel
-            try:
-                new_behavior_state, actions = step_behavior(
-                    behavior_state,
-                    entity_state,
-                    perception_input,
-                    self._config,
-                    current_tick,
-                    delta_time
-                )
-                
-                # Save updated behavior state
-                self._save_behavior_state(entity_id, new_behavior_state)
-                
-                # Convert actions to deltas
-                for action in actions:
-                    delta = self._action_to_delta(action, current_tick)
-                    if delta:
-                        deltas.append(delta)
-                
-            except Exception as e:
+            outcomes = self._executor.map(run_kernel, jobs)
+        else:
+            # Serial: the whole batch goes to the kernel in one call (a
+            # failing job's exception comes back in its slot)
+            outcomes = step_behavior_batch(jobs, config, current_tick, delta_time)
+        
+        # Commit pass: sequential so state writes stay in entity order
+        pending_actions = []
+        outcomes = iter(outcomes)
+        for entity_id, resolved_actions in slots:
+            if resolved_actions is not None:
+                pending_actions.extend(resolved_actions)
+                continue
+            
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
                 alerts.append(Alert(
-                    level="ERROR",
+                    level=_LEVEL_ERROR,
                     step="behavior_kernel",
-                    message=f"Behavior error for {entity_id}: {str(e)}",
+                    message=f"Behavior error for {entity_id}: {str(outcome)}",
                     tick=current_tick,
                     ts=time.time()
                 ))
+                continue
+            
+            new_behavior_state, actions = outcome
+            
+            # Keep the kernel state live; stored dicts are written on flush
+            live_states[entity_id] = new_behavior_state
+            pending_actions.extend(actions)
         
-        return deltas, alerts
+        # Stage 2 input; positions are pinned to the snapshot decided on
+        self._pending = (current_tick, self._positions, pending_actions)
+        return alerts
+    
+    def behavior_emit(self) -> List[Delta]:
+        """
+        Stage 2: convert the actions from the last behavior_decide() to deltas.
+        
+        Memory-bound dict building only; safe to overlap with peer stage-1
+        work. Returns an empty list if there is nothing pending; otherwise
+        the returned list is a buffer cleared on the next call.
+        """
+        if self._pending is None:
+            return []
+        
+        current_tick, positions, actions = self._pending
+        self._pending = None
+        
+        deltas = self._deltas_buf
+        deltas.clear()
+        for action in actions:
+            delta = self._action_to_delta(action, current_tick, positions)
+            if delta:
+                deltas.append(delta)
+        
+        return deltas
     
     # ========================================
     # STATE CONVERSION
     # ========================================
     
+    def _get_step_plan(self, entities: dict) -> Tuple[Tuple[str, EntityState], ...]:
+        """Return the cached step plan, rebuilding it if the entity set changed."""
+        entity_ids = tuple(entities)
+        entity_states = self._entity_states
+        cached_ids, cached_states = self._step_plan_key
+        if cached_states is not entity_states or cached_ids != entity_ids:
+            self._step_plan = tuple(
+                (entity_id, entity_states[entity_id])
+                for entity_id in entity_ids
+                if entity_id in entity_states
+            )
+            self._step_plan_key = (entity_ids, entity_states)
+        return self._step_plan
+    
+    def _validate_kernel_inputs(self, entity_state: EntityState, behavior_data: Optional[dict]) -> Optional[str]:
+        """Return why step_behavior cannot run on these inputs, or None.
+        
+        Only position arity and the stored state code are checked here, so
+        those entities are reported without queuing a kernel job. This is
+        not exhaustive: the kernel call itself is always guarded.
+        """
+        if len(entity_state.position) != 3:
+            return f"invalid position {entity_state.position!r}"
+        # Live states are valid by construction; only stored dicts are checked
+        if behavior_data is not None:
+            current_state = behavior_data.get("current_state", "idle")
+            if current_state not in _STATE_BY_VALUE:
+                return f"invalid state {current_state!r}"
+        return None
+    
+    def _flush_live_states(self, entity_id: Optional[str] = None):
+        """Write live kernel states (all, or one entity's) back to the stored slice."""
+        live_states = self._live_states
+        if not live_states:
+            return
+        entities = self._state_slice.setdefault("entities", {})
+        
+        if entity_id is not None:
+            behavior_state = live_states.pop(entity_id, None)
+            if behavior_state is not None and entity_id in entities:
+                self._save_behavior_state(entity_id, behavior_state)
+            return
+        
+        # Entities removed from the slice since they stepped stay removed
+        for live_id, behavior_state in live_states.items():
+            if live_id in entities:
+                self._save_behavior_state(live_id, behavior_state)
+        live_states.clear()
+    
     def _load_behavior_state(self, entity_id: str, behavior_data: dict) -> BehaviorState:
         """Convert stored state to BehaviorState."""
         target_pos = behavior_data.get("target_position")
@@ -154,14 +426,14 @@ class BehaviorStateView(BaseStateView):
         
         return BehaviorState(
             entity_id=entity_id,
-            current_state=BehaviorStateType(behavior_data.get("current_state", "idle")),
+            current_state=_STATE_BY_VALUE[behavior_data.get("current_state", "idle")],
             target_entity=behavior_data.get("target_entity"),
             target_position=tuple(target_pos) if target_pos else None,
             last_known_position=tuple(last_pos) if last_pos else None,
             state_enter_time=behavior_data.get("state_enter_time", 0.0),
             time_since_target_seen=behavior_data.get("time_since_target_seen", 0.0),
             patrol_index=behavior_data.get("patrol_index", 0),
-            patrol_points=tuple(tuple(p) for p in behavior_data.get("patrol_points", [])),
+            patrol_points=self._load_patrol_points(entity_id, behavior_data.get("patrol_points", [])),
             alert_level=behavior_data.get("alert_level", 0.0)
         )
     
@@ -178,81 +450,74 @@ class BehaviorStateView(BaseStateView):
             "state_enter_time": behavior_state.state_enter_time,
             "time_since_target_seen": behavior_state.time_since_target_seen,
             "patrol_index": behavior_state.patrol_index,
-            "patrol_points": [list(p) for p in behavior_state.patrol_points],
+            "patrol_points": self._store_patrol_points(entity_id, behavior_state.patrol_points),
             "alert_level": behavior_state.alert_level
         }
     
+    def _load_patrol_points(self, entity_id: str, stored: list) -> tuple:
+        """Tuple form of a stored patrol route, converted once per route."""
+        entry = self._patrol_points.get(entity_id)
+        if entry is not None and entry[0] is stored:
+            return entry[1]
+        points = tuple(tuple(p) for p in stored)
+        self._patrol_points[entity_id] = (stored, points)
+        return points
+    
+    def _store_patrol_points(self, entity_id: str, points: tuple) -> list:
+        """Stored list form of a patrol route, reused while the route is unchanged."""
+        entry = self._patrol_points.get(entity_id)
+        if entry is not None and entry[1] is points:
+            return entry[0]
+        stored = [list(p) for p in points]
+        self._patrol_points[entity_id] = (stored, points)
+        return stored
+    
     def _build_perception_input(self, entity_id: str) -> PerceptionInput:
         """Build perception input from perception snapshot."""
         # Get memory for this entity from perception
-        memories = self._perception_snapshot.get("memory", {}).get(entity_id, {})
-        
+        memories = self._perception_snapshot.get("memory", {}).get(entity_id)
+        if not memories:
+            return _EMPTY_PERCEPTION
+        return self._perception_input_from_memories(memories)
+    
+    def _perception_input_from_memories(self, memories: dict) -> PerceptionInput:
+        """Convert one entity's perception memories to kernel input."""
         visible = []
+        visible_positions = []
+        visible_tag_bits = []
         audible = []
         positions = {}
+        tag_bits_by_id = self._tag_bits
         
+        # One pass fills the keyed map and the index-aligned tuples
         for other_id, memory in memories.items():
             if memory.get("certainty", 0) > 0.5:
                 visible.append(other_id)
-                if "last_pos" in memory:
-                    positions[other_id] = tuple(memory["last_pos"])
+                last_pos = memory.get("last_pos")
+                if last_pos is not None:
+                    last_pos = positions[other_id] = tuple(last_pos)
+                visible_positions.append(last_pos)
+                # Entities missing from the spatial snapshot have no tags
+                visible_tag_bits.append(tag_bits_by_id.get(other_id, 0))
         
         return PerceptionInput(
             visible_entities=tuple(visible),
             audible_entities=tuple(audible),
-            entity_positions=positions
+            entity_positions=positions,
+            visible_positions=tuple(visible_positions),
+            visible_tag_bits=tuple(visible_tag_bits)
         )
     
-    def _action_to_delta(self, action: BehaviorAction, tick: float) -> Optional[Delta]:
+    def _action_to_delta(self, action: BehaviorAction, tick: float, positions: Dict[str, list]) -> Optional[Delta]:
         """Convert BehaviorAction to Delta."""
         self._delta_counter += 1
         delta_id = f"behavior_delta_{self._delta_counter}"
         
-        if action.action_type == "move_to":
-            # Request path from Navigation3D
-            return Delta(
-                id=delta_id,
-                type="navigation3d/request_path",
-                payload={
-                    "entity_id": action.entity_id,
-                    "start": self._spatial_snapshot.get("entities", {}).get(action.entity_id, {}).get("pos", [0,0,0]),
-                    "goal": list(action.target_position) if action.target_position else [0,0,0],
-                    "tick": tick
-                },
-                tags=["behavior"]
-            )
-        
-        elif action.action_type == "attack":
-            # Emit attack delta (for future Combat3D)
-            return Delta(
-                id=delta_id,
-                type="behavior3d/attack",
-                payload={
-                    "attacker": action.entity_id,
-                    "target": action.target_entity
-                },
-                tags=["behavior", "combat"]
-            )
-        
-        elif action.action_type == "wait":
-            # No delta needed for waiting
+        # Unknown action types (and "wait") emit no delta
+        build = _DELTA_BUILDERS.get(action.action_type)
+        if build is None:
             return None
-        
-        elif action.action_type == "patrol":
-            # Request path to patrol point
-            return Delta(
-                id=delta_id,
-                type="navigation3d/request_path",
-                payload={
-                    "entity_id": action.entity_id,
-                    "start": self._spatial_snapshot.get("entities", {}).get(action.entity_id, {}).get("pos", [0,0,0]),
-                    "goal": list(action.target_position) if action.target_position else [0,0,0],
-                    "tick": tick
-                },
-                tags=["behavior", "patrol"]
-            )
-        
-        return None
+        return build(action, delta_id, tick, positions)
     
     # ========================================
     # ENTITY MANAGEMENT
@@ -265,9 +530,11 @@ class BehaviorStateView(BaseStateView):
         patrol_points: List[Tuple[float, float, float]] = None
     ) -> Tuple[bool, List[Alert]]:
         """Add entity to behavior system."""
+        # Interned so slice keys match the kernel's ids by identity
+        entity_id = sys.intern(entity_id)
         if entity_id in self._state_slice.get("entities", {}):
             return False, [Alert(
-                level="ERROR",
+                level=_LEVEL_ERROR,
                 step="add_behavior",
                 message=f"Entity {entity_id} already has behavior",
                 tick=self._state_slice.get("tick", 0),
@@ -286,6 +553,7 @@ class BehaviorStateView(BaseStateView):
     
     def get_behavior_state(self, entity_id: str) -> Optional[dict]:
         """Query behavior state for entity."""
+        self._flush_live_states(entity_id)
         return self._state_slice.get("entities", {}).get(entity_id)
 
 
@@ -342,4 +610,9 @@ if __name__ == "__main__":
     print(f"  Guard state: {guard_behavior['current_state']}")
     print(f"  Alert level: {guard_behavior['alert_level']:.2f}")
     
+    # Loading a new slice drops actions decided against the old one
+    adapter.behavior_decide(current_tick=2.0, delta_time=0.016)
+    adapter.load_from_state({"entities": {}})
+    assert adapter.behavior_emit() == [], "Stale actions emitted after load_from_state"
+    
     print("\n✅ Adapter test complete")
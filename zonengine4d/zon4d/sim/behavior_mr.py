@@ -6,15 +6,16 @@ The "mr" (mathematics/rules) kernel for Behavior3D.
 Pure functional finite state machine: no state, no side effects, deterministic.
 
 Snapshot-in → snapshot-out architecture:
-- BehaviorState: Immutable FSM state per entity
+- BehaviorState: FSM state per entity (copied, not mutated, by the kernel)
 - step_behavior(): State transition logic
 - Integrates with Perception3D (what I see) and Navigation3D (where to go)
 
 Portable to C++/Rust/GDExtension.
 """
 
+import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 from enum import Enum
 
 # Type aliases
@@ -37,8 +38,32 @@ class BehaviorStateType(Enum):
     RETURN = "return"
 
 
+# Module-level aliases: the FSM compares these by identity, which skips
+# the Enum class attribute lookup + __eq__ on every branch test.
+IDLE = BehaviorStateType.IDLE
+PATROL = BehaviorStateType.PATROL
+CHASE = BehaviorStateType.CHASE
+ATTACK = BehaviorStateType.ATTACK
+FLEE = BehaviorStateType.FLEE
+SEARCH = BehaviorStateType.SEARCH
+INVESTIGATE = BehaviorStateType.INVESTIGATE
+RETURN = BehaviorStateType.RETURN
+
+
+# Alert level lost per second of simulation time
+ALERT_DECAY_RATE = 0.1
+
+# Squared arrival radii (1.0 at a patrol point, 2.0 back on the route)
+PATROL_REACH_SQ = 1.0
+RETURN_REACH_SQ = 4.0
+
+# States whose FSM branch does nothing while no enemy is visible: only
+# time_since_target_seen and alert_level move (IDLE only without a route)
+DORMANT_STATES = frozenset({IDLE, INVESTIGATE, FLEE})
+
+
 # ============================================================
-# IMMUTABLE DATA STRUCTURES
+# DATA STRUCTURES
 # ============================================================
 
 @dataclass(frozen=True)
@@ -49,6 +74,7 @@ class BehaviorConfig:
     hearing_range: float = 15.0
     attack_range: float = 2.0
     flee_threshold_health: float = 0.3  # Flee when health < 30%
+    flee_distance: float = 10.0        # Flee target distance from the entity
     
     # Chase behavior
     chase_abandon_range: float = 30.0  # Stop chase if target too far
@@ -66,11 +92,41 @@ class BehaviorConfig:
     walk_speed: float = 2.0
     chase_speed: float = 5.0
     flee_speed: float = 6.0
+    
+    # Derived squared ranges (filled in __post_init__, compared against distance_sq)
+    sight_range_sq: float = field(init=False, repr=False, compare=False)
+    hearing_range_sq: float = field(init=False, repr=False, compare=False)
+    attack_range_sq: float = field(init=False, repr=False, compare=False)
+    chase_abandon_range_sq: float = field(init=False, repr=False, compare=False)
+    attack_exit_range_sq: float = field(init=False, repr=False, compare=False)  # ATTACK → CHASE at 1.5x attack_range
+    
+    # Enemy relation per tag class: enemy_table[my_bits][entity_bits] (see
+    # tag_bits); built from is_enemy_bits when not supplied
+    enemy_table: Optional[Tuple[Tuple[bool, ...], ...]] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen dataclass: derived fields must bypass __setattr__
+        object.__setattr__(self, "sight_range_sq", self.sight_range * self.sight_range)
+        object.__setattr__(self, "hearing_range_sq", self.hearing_range * self.hearing_range)
+        object.__setattr__(self, "attack_range_sq", self.attack_range * self.attack_range)
+        object.__setattr__(self, "chase_abandon_range_sq", self.chase_abandon_range * self.chase_abandon_range)
+        attack_exit_range = self.attack_range * 1.5
+        object.__setattr__(self, "attack_exit_range_sq", attack_exit_range * attack_exit_range)
+        if self.enemy_table is None:
+            object.__setattr__(self, "enemy_table", tuple(
+                tuple(is_enemy_bits(entity_bits, my_bits) for entity_bits in range(TAG_CLASSES))
+                for my_bits in range(TAG_CLASSES)
+            ))
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class BehaviorState:
-    """Immutable behavior state for a single entity."""
+    """
+    Behavior state for a single entity.
+    
+    Mutable so transitions write fields in place instead of rebuilding the
+    state; step_behavior works on copy() and never touches its argument.
+    """
     entity_id: str
     current_state: BehaviorStateType
     target_entity: Optional[str] = None
@@ -81,51 +137,36 @@ class BehaviorState:
     patrol_index: int = 0
     patrol_points: Tuple[Vec3, ...] = field(default_factory=tuple)
     alert_level: float = 0.0  # 0.0 = calm, 1.0 = max alert
+    # (route, anchor position, nearest index, safe radius²) - see nearest_patrol_point_cached
+    nearest_patrol_cache: Optional[Tuple[Any, ...]] = field(default=None, compare=False, repr=False)
     
-    def with_state(self, new_state: BehaviorStateType, tick: float) -> 'BehaviorState':
-        """Create new state with updated FSM state."""
-        return BehaviorState(
-            entity_id=self.entity_id,
-            current_state=new_state,
-            target_entity=self.target_entity,
-            target_position=self.target_position,
-            last_known_position=self.last_known_position,
-            state_enter_time=tick,
-            time_since_target_seen=self.time_since_target_seen,
-            patrol_index=self.patrol_index,
-            patrol_points=self.patrol_points,
-            alert_level=self.alert_level
-        )
-    
-    def with_target(self, target_id: Optional[str], target_pos: Optional[Vec3]) -> 'BehaviorState':
-        """Create new state with updated target."""
+    def copy(self) -> 'BehaviorState':
+        """Independent copy (every field holds an immutable value)."""
         return BehaviorState(
-            entity_id=self.entity_id,
-            current_state=self.current_state,
-            target_entity=target_id,
-            target_position=target_pos,
-            last_known_position=target_pos if target_pos else self.last_known_position,
-            state_enter_time=self.state_enter_time,
-            time_since_target_seen=0.0 if target_id else self.time_since_target_seen,
-            patrol_index=self.patrol_index,
-            patrol_points=self.patrol_points,
-            alert_level=self.alert_level
+            self.entity_id, self.current_state, self.target_entity,
+            self.target_position, self.last_known_position,
+            self.state_enter_time, self.time_since_target_seen,
+            self.patrol_index, self.patrol_points, self.alert_level,
+            self.nearest_patrol_cache
         )
     
-    def with_alert(self, alert: float) -> 'BehaviorState':
-        """Create new state with updated alert level."""
-        return BehaviorState(
-            entity_id=self.entity_id,
-            current_state=self.current_state,
-            target_entity=self.target_entity,
-            target_position=self.target_position,
-            last_known_position=self.last_known_position,
-            state_enter_time=self.state_enter_time,
-            time_since_target_seen=self.time_since_target_seen,
-            patrol_index=self.patrol_index,
-            patrol_points=self.patrol_points,
-            alert_level=max(0.0, min(1.0, alert))  # Clamp [0, 1]
-        )
+    def set_state(self, new_state: BehaviorStateType, tick: float) -> None:
+        """Enter a new FSM state."""
+        self.current_state = new_state
+        self.state_enter_time = tick
+    
+    def set_target(self, target_id: Optional[str], target_pos: Optional[Vec3]) -> None:
+        """Update target (and last known position / seen timer)."""
+        self.target_entity = target_id
+        self.target_position = target_pos
+        if target_pos:
+            self.last_known_position = target_pos
+        if target_id:
+            self.time_since_target_seen = 0.0
+    
+    def set_alert(self, alert: float) -> None:
+        """Set alert level, clamped to [0, 1]."""
+        self.alert_level = max(0.0, min(1.0, alert))
 
 
 @dataclass(frozen=True)
@@ -134,6 +175,26 @@ class PerceptionInput:
     visible_entities: Tuple[str, ...] = field(default_factory=tuple)
     audible_entities: Tuple[str, ...] = field(default_factory=tuple)
     entity_positions: Dict[str, Vec3] = field(default_factory=dict)
+    entity_tags: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    # Last known position of each visible entity, index-aligned with
+    # visible_entities (None if unknown); derived from entity_positions
+    # when not supplied
+    visible_positions: Optional[Tuple[Optional[Vec3], ...]] = field(default=None, compare=False)
+    # Tag bitmask of each visible entity (see tag_bits), index-aligned with
+    # visible_entities; derived from entity_tags when not supplied
+    visible_tag_bits: Optional[Tuple[int, ...]] = field(default=None, compare=False)
+    
+    def __post_init__(self):
+        if self.visible_positions is None:
+            positions = self.entity_positions
+            object.__setattr__(self, "visible_positions", tuple(
+                positions.get(eid) for eid in self.visible_entities
+            ))
+        if self.visible_tag_bits is None:
+            tags = self.entity_tags
+            object.__setattr__(self, "visible_tag_bits", tuple(
+                tag_bits(tags.get(eid, ())) for eid in self.visible_entities
+            ))
 
 
 @dataclass(frozen=True)
@@ -142,9 +203,16 @@ class EntityState:
     position: Vec3
     health: float = 1.0
     tags: Tuple[str, ...] = field(default_factory=tuple)
+    # Classification bitmask of tags (see tag_bits); folded at construction
+    # when not supplied so enemy checks are bit tests
+    tag_bits: Optional[int] = field(default=None, compare=False)
+    
+    def __post_init__(self):
+        if self.tag_bits is None:
+            object.__setattr__(self, "tag_bits", tag_bits(self.tags))
 
 
-@dataclass
+@dataclass(slots=True)
 class BehaviorAction:
     """Action output from behavior system."""
     entity_id: str
@@ -160,23 +228,379 @@ class BehaviorAction:
 
 def distance(a: Vec3, b: Vec3) -> float:
     """Calculate Euclidean distance between two points."""
-    return ((a[0] - b[0])**2 + (a[1] - b[1])**2 + (a[2] - b[2])**2) ** 0.5
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return (dx*dx + dy*dy + dz*dz) ** 0.5
 
 
-def is_enemy(entity_tags: Tuple[str, ...], my_tags: Tuple[str, ...]) -> bool:
-    """Determine if entity is an enemy based on tags."""
+def distance_sq(a: Vec3, b: Vec3) -> float:
+    """Squared Euclidean distance (no sqrt) for range comparisons."""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx*dx + dy*dy + dz*dz
+
+
+# Tag bitmasks: enemy classification becomes integer AND/OR instead of
+# repeated string membership scans over tag tuples
+TAG_PLAYER = 1
+TAG_NPC = 2
+TAG_HOSTILE = 4
+TAG_ENEMY = 8
+TAG_CLASSES = 16  # every combination of the bits above
+
+_TAG_BITS = {
+    "player": TAG_PLAYER,
+    "npc": TAG_NPC,
+    "hostile": TAG_HOSTILE,
+    "enemy": TAG_ENEMY,
+}
+
+
+def tag_bits(tags) -> int:
+    """Fold a tag sequence into its classification bitmask."""
+    bits = 0
+    for tag in tags:
+        bits |= _TAG_BITS.get(tag, 0)
+    return bits
+
+
+def is_enemy_bits(entity_bits: int, my_bits: int) -> bool:
+    """is_enemy() on precomputed tag bitmasks."""
     # Simple heuristic: "player" is enemy to "npc", "hostile" tags
-    if "player" in entity_tags and ("npc" in my_tags or "hostile" in my_tags):
+    if entity_bits & TAG_PLAYER and my_bits & (TAG_NPC | TAG_HOSTILE):
         return True
-    if "enemy" in entity_tags:
-        return True
-    return False
+    return bool(entity_bits & TAG_ENEMY)
+
+
+def is_enemy(entity_tags: Tuple[str, ...], my_tags: Tuple[str, ...]) -> bool:
+    """Determine if entity is an enemy based on tags."""
+    return is_enemy_bits(tag_bits(entity_tags), tag_bits(my_tags))
 
 
 # ============================================================
 # FSM TRANSITION LOGIC
 # ============================================================
 
+def nearest_patrol_point_cached(behavior_state: BehaviorState, position: Vec3) -> Tuple[Vec3, float]:
+    """
+    Nearest point of a (non-empty) patrol route and its squared distance,
+    with the winning index remembered on the state.
+    
+    Routes are a handful of points, so a single inlined scan beats any
+    index structure; ties go to the earliest point on the route. The scan
+    also records half the gap between the nearest and the runner-up
+    distance. By the triangle inequality the same point stays strictly
+    nearest while the entity is within that radius of where the scan ran,
+    so only its distance is recomputed. Any other move (or a new
+    route) rescans, so the result always equals a fresh scan.
+    """
+    patrol_points = behavior_state.patrol_points
+    px, py, pz = position
+    cache = behavior_state.nearest_patrol_cache
+    if cache is not None and cache[0] is patrol_points:
+        _, (ax, ay, az), index, safe_sq = cache
+        dx = px - ax
+        dy = py - ay
+        dz = pz - az
+        if dx*dx + dy*dy + dz*dz < safe_sq:
+            point = patrol_points[index]
+            dx = point[0] - px
+            dy = point[1] - py
+            dz = point[2] - pz
+            return point, dx*dx + dy*dy + dz*dz
+    
+    index = 0
+    best_sq = second_sq = float("inf")
+    for i, point in enumerate(patrol_points):
+        dx = point[0] - px
+        dy = point[1] - py
+        dz = point[2] - pz
+        d_sq = dx*dx + dy*dy + dz*dz
+        if d_sq < best_sq:
+            index, best_sq, second_sq = i, d_sq, best_sq
+        elif d_sq < second_sq:
+            second_sq = d_sq
+    # Shrunk slightly so rounding can never let a near-tie through
+    safe = 0.49 * (math.sqrt(second_sq) - math.sqrt(best_sq))
+    behavior_state.nearest_patrol_cache = (patrol_points, position, index, safe * safe)
+    return patrol_points[index], best_sq
+
+
+def is_dormant(behavior_state: BehaviorState, perception: PerceptionInput) -> bool:
+    """
+    True when step_behavior can only age this entity's timers.
+    
+    Nothing visible means no enemy (so no flee or chase), and the dormant
+    states have no other transitions once there is no patrol route.
+    """
+    return (not perception.visible_entities
+            and behavior_state.current_state in DORMANT_STATES
+            and not behavior_state.patrol_points)
+
+
+def advance_dormant(behavior_state: BehaviorState, delta_time: float) -> List[BehaviorAction]:
+    """
+    Apply step_behavior's result for a dormant entity in place.
+    
+    Only valid when is_dormant() holds; returns the step's actions (IDLE
+    still waits).
+    """
+    behavior_state.time_since_target_seen += delta_time
+    behavior_state.set_alert(behavior_state.alert_level - ALERT_DECAY_RATE * delta_time)
+    if behavior_state.current_state is IDLE:
+        return [BehaviorAction(entity_id=behavior_state.entity_id, action_type="wait")]
+    return []
+
+
+# ============================================================
+# FSM STATE HANDLERS
+# ============================================================
+
+def _handle_idle(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """IDLE state: transitions and actions for one entity."""
+    # Transition: Enemy seen → CHASE
+    if first_enemy:
+        enemy_id, enemy_pos = first_enemy
+        behavior_state.set_state(CHASE, current_tick)
+        behavior_state.set_target(enemy_id, enemy_pos)
+        behavior_state.set_alert(1.0)
+    
+    # Transition: Has patrol route → PATROL
+    elif behavior_state.patrol_points:
+        behavior_state.set_state(PATROL, current_tick)
+    
+    # Stay idle - wait action
+    else:
+        actions.append(BehaviorAction(
+            entity_id=behavior_state.entity_id,
+            action_type="wait"
+        ))
+
+
+def _handle_patrol(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """PATROL state: transitions and actions for one entity."""
+    # Transition: Enemy seen → CHASE
+    if first_enemy:
+        enemy_id, enemy_pos = first_enemy
+        behavior_state.set_state(CHASE, current_tick)
+        behavior_state.set_target(enemy_id, enemy_pos)
+        behavior_state.set_alert(1.0)
+    
+    # Continue patrol
+    elif behavior_state.patrol_points:
+        patrol_target = behavior_state.patrol_points[behavior_state.patrol_index]
+        
+        # Check if reached patrol point
+        dist_sq_to_point = distance_sq(entity_state.position, patrol_target)
+        if dist_sq_to_point < PATROL_REACH_SQ:
+            # Wait at patrol point
+            time_at_point = current_tick - behavior_state.state_enter_time
+            if time_at_point < config.patrol_wait_time:
+                actions.append(BehaviorAction(
+                    entity_id=behavior_state.entity_id,
+                    action_type="wait"
+                ))
+            else:
+                # Move to next patrol point
+                next_index = (behavior_state.patrol_index + 1) % len(behavior_state.patrol_points)
+                behavior_state.state_enter_time = current_tick
+                behavior_state.patrol_index = next_index
+        else:
+            # Move to patrol point
+            actions.append(BehaviorAction(
+                entity_id=behavior_state.entity_id,
+                action_type="patrol",
+                target_position=patrol_target,
+                speed=config.patrol_speed
+            ))
+
+
+def _handle_chase(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """CHASE state: transitions and actions for one entity."""
+    # Update target position if visible
+    if behavior_state.target_entity in perception.visible_entities:
+        target_pos = perception.entity_positions.get(behavior_state.target_entity)
+        behavior_state.set_target(behavior_state.target_entity, target_pos)
+    
+    if behavior_state.target_entity and behavior_state.target_position:
+        dist_sq_to_target = distance_sq(entity_state.position, behavior_state.target_position)
+        
+        # Transition: In attack range → ATTACK
+        if dist_sq_to_target < config.attack_range_sq:
+            behavior_state.set_state(ATTACK, current_tick)
+        
+        # Transition: Lost target for too long → SEARCH
+        elif behavior_state.time_since_target_seen > config.chase_abandon_time:
+            behavior_state.set_state(SEARCH, current_tick)
+        
+        # Transition: Target too far → RETURN
+        elif dist_sq_to_target > config.chase_abandon_range_sq:
+            behavior_state.set_state(RETURN, current_tick)
+        
+        # Continue chase
+        else:
+            actions.append(BehaviorAction(
+                entity_id=behavior_state.entity_id,
+                action_type="move_to",
+                target_entity=behavior_state.target_entity,
+                target_position=behavior_state.target_position,
+                speed=config.chase_speed
+            ))
+
+
+def _handle_attack(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """ATTACK state: transitions and actions for one entity."""
+    if behavior_state.target_entity:
+        # Check if still in range
+        target_pos = perception.entity_positions.get(behavior_state.target_entity)
+        if target_pos:
+            dist_sq = distance_sq(entity_state.position, target_pos)
+            if dist_sq > config.attack_exit_range_sq:
+                # Target moved away → CHASE
+                behavior_state.set_state(CHASE, current_tick)
+            else:
+                # Attack!
+                actions.append(BehaviorAction(
+                    entity_id=behavior_state.entity_id,
+                    action_type="attack",
+                    target_entity=behavior_state.target_entity
+                ))
+        else:
+            # Lost sight → SEARCH
+            behavior_state.set_state(SEARCH, current_tick)
+
+
+def _handle_search(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """SEARCH state: transitions and actions for one entity."""
+    time_in_search = current_tick - behavior_state.state_enter_time
+    
+    # Transition: Found target again → CHASE
+    if first_enemy:
+        enemy_id, enemy_pos = first_enemy
+        behavior_state.set_state(CHASE, current_tick)
+        behavior_state.set_target(enemy_id, enemy_pos)
+    
+    # Transition: Search timeout → RETURN
+    elif time_in_search > config.search_duration:
+        behavior_state.set_state(RETURN, current_tick)
+    
+    # Continue searching last known position
+    elif behavior_state.last_known_position:
+        actions.append(BehaviorAction(
+            entity_id=behavior_state.entity_id,
+            action_type="move_to",
+            target_position=behavior_state.last_known_position,
+            speed=config.walk_speed
+        ))
+
+
+def _handle_return(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """RETURN state: transitions and actions for one entity."""
+    # Transition: Enemy seen → CHASE
+    if first_enemy:
+        enemy_id, enemy_pos = first_enemy
+        behavior_state.set_state(CHASE, current_tick)
+        behavior_state.set_target(enemy_id, enemy_pos)
+    
+    # Return to patrol or idle
+    elif behavior_state.patrol_points:
+        # Return to nearest patrol point
+        nearest_point, dist_sq_to_patrol = nearest_patrol_point_cached(
+            behavior_state, entity_state.position
+        )
+        
+        if dist_sq_to_patrol < RETURN_REACH_SQ:
+            # Reached patrol route → PATROL
+            behavior_state.set_state(PATROL, current_tick)
+        else:
+            # Move to patrol route
+            actions.append(BehaviorAction(
+                entity_id=behavior_state.entity_id,
+                action_type="move_to",
+                target_position=nearest_point,
+                speed=config.walk_speed
+            ))
+    else:
+        # No patrol route → IDLE
+        behavior_state.set_state(IDLE, current_tick)
+
+
+def _handle_none(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    first_enemy: Optional[Tuple[str, Optional[Vec3]]],
+    config: BehaviorConfig,
+    current_tick: float,
+    actions: List[BehaviorAction]
+) -> None:
+    """FLEE / INVESTIGATE: no per-state transitions (flee is handled up front)."""
+
+
+# Per-state handlers, one entry for every BehaviorStateType, so dispatch is
+# a single lookup and call with no branch
+_STATE_HANDLERS = {
+    IDLE: _handle_idle,
+    PATROL: _handle_patrol,
+    CHASE: _handle_chase,
+    ATTACK: _handle_attack,
+    FLEE: _handle_none,
+    SEARCH: _handle_search,
+    INVESTIGATE: _handle_none,
+    RETURN: _handle_return,
+}
+
+
 def step_behavior(
     behavior_state: BehaviorState,
     entity_state: EntityState,
@@ -213,50 +637,61 @@ def step_behavior(
         (new_behavior_state, actions)
     """
     actions = []
+    return _step_into(behavior_state, entity_state, perception, config,
+                      current_tick, delta_time, actions), actions
+
+
+def _step_into(
+    behavior_state: BehaviorState,
+    entity_state: EntityState,
+    perception: PerceptionInput,
+    config: BehaviorConfig,
+    current_tick: float,
+    delta_time: float,
+    actions: List[BehaviorAction]
+) -> BehaviorState:
+    """step_behavior() appending its actions to a caller-owned list."""
+    # Work on one copy; transitions write its fields in place and it is
+    # returned as the new state (the input state is never touched).
+    behavior_state = behavior_state.copy()
+    
+    # Fast path: nothing can change for a dormant entity except its timers
+    if is_dormant(behavior_state, perception):
+        actions.extend(advance_dormant(behavior_state, delta_time))
+        return behavior_state
     
     # Update time since target seen
-    time_since_seen = behavior_state.time_since_target_seen + delta_time
-    behavior_state = BehaviorState(
-        entity_id=behavior_state.entity_id,
-        current_state=behavior_state.current_state,
-        target_entity=behavior_state.target_entity,
-        target_position=behavior_state.target_position,
-        last_known_position=behavior_state.last_known_position,
-        state_enter_time=behavior_state.state_enter_time,
-        time_since_target_seen=time_since_seen,
-        patrol_index=behavior_state.patrol_index,
-        patrol_points=behavior_state.patrol_points,
-        alert_level=behavior_state.alert_level
-    )
-    
-    # Find enemies in perception
-    enemies_seen = [
-        eid for eid in perception.visible_entities
-        if is_enemy(
-            perception.entity_positions.get(eid, (0, 0, 0)),  # Placeholder, need tags
-            entity_state.tags
-        )
-    ]
+    behavior_state.time_since_target_seen += delta_time
+    
+    # Find the first visible enemy: one table load per visible entity, using
+    # tag bits folded at ingest. Only the first enemy drives transitions, so
+    # the scan stops there instead of classifying every visible entity.
+    enemy_row = config.enemy_table[entity_state.tag_bits]
+    first_enemy = None  # (entity_id, position), walked over the aligned tuples
+    for eid, pos, bits in zip(perception.visible_entities, perception.visible_positions,
+                              perception.visible_tag_bits):
+        if enemy_row[bits]:
+            first_enemy = (eid, pos)
+            break
     
     # Priority check: Flee if low health
-    if entity_state.health < config.flee_threshold_health and enemies_seen:
-        if behavior_state.current_state != BehaviorStateType.FLEE:
-            behavior_state = behavior_state.with_state(BehaviorStateType.FLEE, current_tick)
+    if entity_state.health < config.flee_threshold_health and first_enemy:
+        if behavior_state.current_state is not FLEE:
+            behavior_state.set_state(FLEE, current_tick)
             # Flee away from closest enemy
-            if enemies_seen and enemies_seen[0] in perception.entity_positions:
-                enemy_pos = perception.entity_positions[enemies_seen[0]]
+            enemy_pos = first_enemy[1]
+            if enemy_pos is not None:
                 # Calculate flee direction (opposite of enemy)
-                dx = entity_state.position[0] - enemy_pos[0]
-                dy = entity_state.position[1] - enemy_pos[1]
-                dz = entity_state.position[2] - enemy_pos[2]
-                mag = (dx**2 + dy**2 + dz**2) ** 0.5
-                if mag > 0:
-                    flee_pos = (
-                        entity_state.position[0] + dx/mag * 10,
-                        entity_state.position[1] + dy/mag * 10,
-                        entity_state.position[2] + dz/mag * 10
-                    )
-                    behavior_state = behavior_state.with_target(None, flee_pos)
+                px, py, pz = entity_state.position
+                dx = px - enemy_pos[0]
+                dy = py - enemy_pos[1]
+                dz = pz - enemy_pos[2]
+                mag_sq = dx*dx + dy*dy + dz*dz
+                if mag_sq > 0:
+                    # One sqrt and one division scale all three axes
+                    inv = config.flee_distance / math.sqrt(mag_sq)
+                    flee_pos = (px + dx*inv, py + dy*inv, pz + dz*inv)
+                    behavior_state.set_target(None, flee_pos)
         
         # Flee action
         if behavior_state.target_position:
@@ -267,207 +702,72 @@ def step_behavior(
                 speed=config.flee_speed
             ))
         
-        return behavior_state, actions
-    
-    # FSM State Machine
-    current = behavior_state.current_state
-    
-    # ========================================
-    # IDLE State
-    # ========================================
-    if current == BehaviorStateType.IDLE:
-        # Transition: Enemy seen → CHASE
-        if enemies_seen:
-            enemy_id = enemies_seen[0]
-            enemy_pos = perception.entity_positions.get(enemy_id)
-            behavior_state = behavior_state.with_state(BehaviorStateType.CHASE, current_tick)
-            behavior_state = behavior_state.with_target(enemy_id, enemy_pos)
-            behavior_state = behavior_state.with_alert(1.0)
-        
-        # Transition: Has patrol route → PATROL
-        elif behavior_state.patrol_points:
-            behavior_state = behavior_state.with_state(BehaviorStateType.PATROL, current_tick)
-        
-        # Stay idle - wait action
-        else:
-            actions.append(BehaviorAction(
-                entity_id=behavior_state.entity_id,
-                action_type="wait"
-            ))
+        return behavior_state
     
-    # ========================================
-    # PATROL State
-    # ========================================
-    elif current == BehaviorStateType.PATROL:
-        # Transition: Enemy seen → CHASE
-        if enemies_seen:
-            enemy_id = enemies_seen[0]
-            enemy_pos = perception.entity_positions.get(enemy_id)
-            behavior_state = behavior_state.with_state(BehaviorStateType.CHASE, current_tick)
-            behavior_state = behavior_state.with_target(enemy_id, enemy_pos)
-            behavior_state = behavior_state.with_alert(1.0)
-        
-        # Continue patrol
-        elif behavior_state.patrol_points:
-            patrol_target = behavior_state.patrol_points[behavior_state.patrol_index]
-            
-            # Check if reached patrol point
-            dist_to_point = distance(entity_state.position, patrol_target)
-            if dist_to_point < 1.0:
-                # Wait at patrol point
-                time_at_point = current_tick - behavior_state.state_enter_time
-                if time_at_point < config.patrol_wait_time:
-                    actions.append(BehaviorAction(
-                        entity_id=behavior_state.entity_id,
-                        action_type="wait"
-                    ))
-                else:
-                    # Move to next patrol point
-                    next_index = (behavior_state.patrol_index + 1) % len(behavior_state.patrol_points)
-                    behavior_state = BehaviorState(
-                        entity_id=behavior_state.entity_id,
-                        current_state=behavior_state.current_state,
-                        target_entity=behavior_state.target_entity,
-                        target_position=behavior_state.target_position,
-                        last_known_position=behavior_state.last_known_position,
-                        state_enter_time=current_tick,
-                        time_since_target_seen=behavior_state.time_since_target_seen,
-                        patrol_index=next_index,
-                        patrol_points=behavior_state.patrol_points,
-                        alert_level=behavior_state.alert_level
-                    )
-            else:
-                # Move to patrol point
-                actions.append(BehaviorAction(
-                    entity_id=behavior_state.entity_id,
-                    action_type="patrol",
-                    target_position=patrol_target,
-                    speed=config.patrol_speed
-                ))
+    # FSM State Machine: table dispatch, one handler per state
+    _STATE_HANDLERS[behavior_state.current_state](
+        behavior_state, entity_state, perception, first_enemy, config, current_tick, actions
+    )
     
-    # ========================================
-    # CHASE State
-    # ========================================
-    elif current == BehaviorStateType.CHASE:
-        # Update target position if visible
-        if behavior_state.target_entity in perception.visible_entities:
-            target_pos = perception.entity_positions.get(behavior_state.target_entity)
-            behavior_state = behavior_state.with_target(behavior_state.target_entity, target_pos)
-        
-        if behavior_state.target_entity and behavior_state.target_position:
-            dist_to_target = distance(entity_state.position, behavior_state.target_position)
-            
-            # Transition: In attack range → ATTACK
-            if dist_to_target < config.attack_range:
-                behavior_state = behavior_state.with_state(BehaviorStateType.ATTACK, current_tick)
-            
-            # Transition: Lost target for too long → SEARCH
-            elif behavior_state.time_since_target_seen > config.chase_abandon_time:
-                behavior_state = behavior_state.with_state(BehaviorStateType.SEARCH, current_tick)
-            
-            # Transition: Target too far → RETURN
-            elif dist_to_target > config.chase_abandon_range:
-                behavior_state = behavior_state.with_state(BehaviorStateType.RETURN, current_tick)
-            
-            # Continue chase
-            else:
-                actions.append(BehaviorAction(
-                    entity_id=behavior_state.entity_id,
-                    action_type="move_to",
-                    target_entity=behavior_state.target_entity,
-                    target_position=behavior_state.target_position,
-                    speed=config.chase_speed
-                ))
+    # Decay alert level
+    alert_decay = ALERT_DECAY_RATE * delta_time
+    behavior_state.set_alert(behavior_state.alert_level - alert_decay)
     
-    # ========================================
-    # ATTACK State
-    # ========================================
-    elif current == BehaviorStateType.ATTACK:
-        if behavior_state.target_entity:
-            # Check if still in range
-            target_pos = perception.entity_positions.get(behavior_state.target_entity)
-            if target_pos:
-                dist = distance(entity_state.position, target_pos)
-                if dist > config.attack_range * 1.5:
-                    # Target moved away → CHASE
-                    behavior_state = behavior_state.with_state(BehaviorStateType.CHASE, current_tick)
-                else:
-                    # Attack!
-                    actions.append(BehaviorAction(
-                        entity_id=behavior_state.entity_id,
-                        action_type="attack",
-                        target_entity=behavior_state.target_entity
-                    ))
-            else:
-                # Lost sight → SEARCH
-                behavior_state = behavior_state.with_state(BehaviorStateType.SEARCH, current_tick)
-    
-    # ========================================
-    # SEARCH State
-    # ========================================
-    elif current == BehaviorStateType.SEARCH:
-        time_in_search = current_tick - behavior_state.state_enter_time
-        
-        # Transition: Found target again → CHASE
-        if enemies_seen:
-            enemy_id = enemies_seen[0]
-            enemy_pos = perception.entity_positions.get(enemy_id)
-            behavior_state = behavior_state.with_state(BehaviorStateType.CHASE, current_tick)
-            behavior_state = behavior_state.with_target(enemy_id, enemy_pos)
-        
-        # Transition: Search timeout → RETURN
-        elif time_in_search > config.search_duration:
-            behavior_state = behavior_state.with_state(BehaviorStateType.RETURN, current_tick)
-        
-        # Continue searching last known position
-        elif behavior_state.last_known_position:
-            actions.append(BehaviorAction(
-                entity_id=behavior_state.entity_id,
-                action_type="move_to",
-                target_position=behavior_state.last_known_position,
-                speed=config.walk_speed
-            ))
+    return behavior_state
+
+
+def step_behavior_batch(
+    jobs: List[Tuple[BehaviorState, EntityState, PerceptionInput]],
+    config: BehaviorConfig,
+    current_tick: float,
+    delta_time: float
+) -> List[Union[Tuple[BehaviorState, Tuple[BehaviorAction, ...]], Exception]]:
+    """
+    step_behavior over many entities in one call.
     
-    # ========================================
-    # RETURN State
-    # ========================================
-    elif current == BehaviorStateType.RETURN:
-        # Transition: Enemy seen → CHASE
-        if enemies_seen:
-            enemy_id = enemies_seen[0]
-            enemy_pos = perception.entity_positions.get(enemy_id)
-            behavior_state = behavior_state.with_state(BehaviorStateType.CHASE, current_tick)
-            behavior_state = behavior_state.with_target(enemy_id, enemy_pos)
-        
-        # Return to patrol or idle
-        elif behavior_state.patrol_points:
-            # Return to nearest patrol point
-            nearest_point = min(
-                behavior_state.patrol_points,
-                key=lambda p: distance(entity_state.position, p)
-            )
-            dist_to_patrol = distance(entity_state.position, nearest_point)
-            
-            if dist_to_patrol < 2.0:
-                # Reached patrol route → PATROL
-                behavior_state = behavior_state.with_state(BehaviorStateType.PATROL, current_tick)
-            else:
-                # Move to patrol route
-                actions.append(BehaviorAction(
-                    entity_id=behavior_state.entity_id,
-                    action_type="move_to",
-                    target_position=nearest_point,
-                    speed=config.walk_speed
-                ))
-        else:
-            # No patrol route → IDLE
-            behavior_state = behavior_state.with_state(BehaviorStateType.IDLE, current_tick)
+    Jobs are grouped by FSM state and each state's bucket is stepped
+    together, so consecutive steps run the same handler; entities are
+    independent, so the order only affects locality, not results.
+    Every step writes into one reused action buffer; a job's actions are
+    copied out as a tuple only if it emitted any.
     
-    # Decay alert level
-    alert_decay = 0.1 * delta_time
-    behavior_state = behavior_state.with_alert(behavior_state.alert_level - alert_decay)
+    A failing job is contained: its slot holds the exception and the
+    other jobs still run.
     
-    return behavior_state, actions
+    Args:
+        jobs: (behavior_state, entity_state, perception) per entity
+        config: Behavior configuration shared by all entities
+        current_tick: Current game time
+        delta_time: Time since last step
+        
+    Returns:
+        (new_behavior_state, actions) per job, in job order (or the
+        exception a job raised)
+    """
+    buckets: Dict[BehaviorStateType, List[int]] = {}
+    for index, job in enumerate(jobs):
+        buckets.setdefault(job[0].current_state, []).append(index)
+    
+    step = _step_into
+    buffer: List[BehaviorAction] = []
+    results: List[Union[Tuple[BehaviorState, Tuple[BehaviorAction, ...]], Exception]] = [None] * len(jobs)
+    for indices in buckets.values():
+        for index in indices:
+            behavior_state, entity_state, perception = jobs[index]
+            try:
+                new_state = step(behavior_state, entity_state, perception, config,
+                                 current_tick, delta_time, buffer)
+            except Exception as e:
+                # Drop any actions the failed step emitted
+                buffer.clear()
+                results[index] = e
+                continue
+            if buffer:
+                results[index] = (new_state, tuple(buffer))
+                buffer.clear()
+            else:
+                results[index] = (new_state, ())
+    return results
 
 
 # ============================================================
@@ -525,7 +825,8 @@ if __name__ == "__main__":
     perception = PerceptionInput(
         visible_entities=("player",),
         audible_entities=(),
-        entity_positions={"player": (15.0, 0.0, 0.0)}
+        entity_positions={"player": (15.0, 0.0, 0.0)},
+        entity_tags={"player": ("player",)}
     )
     
     entity_state = EntityState(
@@ -544,6 +845,8 @@ if __name__ == "__main__":
     print(f"  Actions: {len(actions)}")
     if actions:
         print(f"  Action: {actions[0].action_type} → {actions[0].target_position}")
+    assert new_state.current_state is BehaviorStateType.CHASE, "Guard should chase a visible player"
+    assert new_state.target_entity == "player"
     print()
     
     # Test 3: Low health → flee
@@ -563,6 +866,112 @@ if __name__ == "__main__":
     print(f"  Actions: {len(actions)}")
     if actions:
         print(f"  Action: {actions[0].action_type} speed={actions[0].speed}")
+    assert new_state.current_state is BehaviorStateType.FLEE, "Damaged guard should flee"
+    assert actions and actions[0].speed == config.flee_speed
+    print()
+    
+    # Test 4: Enemy in attack range → attack
+    print("TEST 4: Enemy in attack range → attack")
+    perception_close = PerceptionInput(
+        visible_entities=("player",),
+        audible_entities=(),
+        entity_positions={"player": (1.0, 0.0, 0.0)},
+        entity_tags={"player": ("player",)}
+    )
+    
+    new_state, actions = step_behavior(
+        behavior_state, entity_state, perception_close, config, 1.0, 0.1
+    )
+    new_state, actions = step_behavior(
+        new_state, entity_state, perception_close, config, 1.1, 0.1
+    )
+    
+    print(f"  State: {new_state.current_state.value}")
+    assert new_state.current_state is BehaviorStateType.ATTACK, "Guard should attack an adjacent player"
+    print()
+    
+    # Test 5: Non-enemy in view → no reaction
+    print("TEST 5: Non-enemy in view → keeps patrolling")
+    perception_friend = PerceptionInput(
+        visible_entities=("villager",),
+        audible_entities=(),
+        entity_positions={"villager": (3.0, 0.0, 0.0)},
+        entity_tags={"villager": ("npc",)}
+    )
+    
+    new_state, actions = step_behavior(
+        behavior_state, entity_state, perception_friend, config, 1.0, 0.1
+    )
+    
+    print(f"  State: {new_state.current_state.value}")
+    print(f"  Target: {new_state.target_entity}")
+    assert new_state.current_state is BehaviorStateType.PATROL, "A friendly NPC must not trigger a transition"
+    assert new_state.target_entity is None
+    print()
+    
+    # Test 6: Derived per-visible fields follow visible_entities order
+    print("TEST 6: Derived tag bits / positions aligned with visible_entities")
+    perception_mixed = PerceptionInput(
+        visible_entities=("villager", "player", "ghost"),
+        entity_positions={"player": (15.0, 0.0, 0.0), "villager": (3.0, 0.0, 0.0)},
+        entity_tags={"player": ("player",), "villager": ("npc",)}
+    )
+    
+    print(f"  Tag bits: {perception_mixed.visible_tag_bits}")
+    assert perception_mixed.visible_tag_bits == (tag_bits(("npc",)), tag_bits(("player",)), 0)
+    assert perception_mixed.visible_positions == ((3.0, 0.0, 0.0), (15.0, 0.0, 0.0), None)
+    
+    new_state, actions = step_behavior(
+        behavior_state, entity_state, perception_mixed, config, 1.0, 0.1
+    )
+    assert new_state.target_entity == "player", "The enemy, not the first visible entity, is targeted"
+    print()
+    
+    # Test 7: Batch entry point matches per-entity steps in every state
+    print("TEST 7: step_behavior_batch vs step_behavior (all FSM states)")
+    scenarios = [
+        (entity_state, PerceptionInput()),
+        (entity_state, perception),
+        (entity_state, perception_close),
+        (entity_state, perception_friend),
+        (entity_state_damaged, perception_close),
+    ]
+    jobs = []
+    for state_type in BehaviorStateType:
+        for route in (patrol_route, ()):
+            for target in (None, "player"):
+                for body, seen in scenarios:
+                    jobs.append((
+                        BehaviorState(
+                            entity_id=f"npc{len(jobs)}",
+                            current_state=state_type,
+                            target_entity=target,
+                            target_position=(15.0, 0.0, 0.0) if target else None,
+                            last_known_position=(12.0, 0.0, 0.0) if target else None,
+                            state_enter_time=0.0,
+                            time_since_target_seen=float(len(jobs) % 13),
+                            patrol_points=route,
+                            alert_level=0.5,
+                        ),
+                        body,
+                        seen,
+                    ))
+    
+    batch = step_behavior_batch(jobs, config, 6.0, 0.5)
+    single = [step_behavior(*job, config, 6.0, 0.5) for job in jobs]
+    matches = sum(
+        got == (want_state, tuple(want_actions))
+        for got, (want_state, want_actions) in zip(batch, single)
+    )
+    print(f"  Jobs: {len(jobs)}, matching: {matches}")
+    assert matches == len(jobs), "Batch results differ from per-entity steps"
+    
+    # A failing job is contained to its own slot
+    bad_job = (jobs[0][0], EntityState(position=None, health=0.2, tags=("npc",)), perception_close)
+    batch = step_behavior_batch([jobs[1], bad_job, jobs[2]], config, 6.0, 0.5)
+    assert isinstance(batch[1], Exception)
+    assert batch[0] == (single[1][0], tuple(single[1][1]))
+    assert batch[2] == (single[2][0], tuple(single[2][1]))
     print()
     
     print("✅ behavior_mr kernel tests complete")
@@ -11,14 +11,14 @@ Imperative wrapper that:
 Follows the canonical EngAIn adapter pattern from Spatial3D/Perception3D.
 """
 
-from collections import deque
+import sys
 from typing import Dict, Any, List, Tuple
 
 from combat3d_mr import (
     CombatSnapshot,
     CombatEntity,
     DamageEvent,
-    step_combat,
+    apply_damage_events,
 )
 
 
@@ -29,7 +29,10 @@ class Combat3DAdapter:
     """
     
     def __init__(self):
-        self.damage_queue = deque()
+        # Double-buffered: tick() swaps the filled queue for the drained
+        # spare, so neither list is copied or reallocated per tick
+        self.damage_queue = []
+        self._spare_queue = []
         self.snapshot = CombatSnapshot(entities={})
 
     def register_entity(self, entity_id: str, health: float, max_health: float):
@@ -42,6 +45,10 @@ class Combat3DAdapter:
             health: Current health value
             max_health: Maximum health capacity
         """
+        # Interned once here so every later probe with an interned id
+        # (see handle_delta) matches by identity instead of comparing text
+        entity_id = sys.intern(entity_id)
+
         # Note: Mutates snapshot dict directly (adapter layer mutability)
         self.snapshot.entities[entity_id] = CombatEntity(
             entity_id=entity_id,
@@ -66,8 +73,8 @@ class Combat3DAdapter:
         """
         if delta_type == "combat3d/apply_damage":
             evt = DamageEvent(
-                source_id=payload["source"],
-                target_id=payload["target"],
+                source_id=sys.intern(payload["source"]),
+                target_id=sys.intern(payload["target"]),
                 amount=payload["amount"],
                 damage_type=payload.get("damage_type", "normal"),
             )
@@ -81,17 +88,19 @@ class Combat3DAdapter:
         Returns:
             List of (delta_type, payload) tuples for other subsystems
         """
-        # Collect all damage for this tick
-        damage_events = list(self.damage_queue)
-        self.damage_queue.clear()
+        # Collect all damage for this tick; new deltas go to the spare
+        damage_events = self.damage_queue
+        self.damage_queue = self._spare_queue
 
-        # Call pure MR kernel
-        output = step_combat(self.snapshot, damage_events)
-        self.snapshot = output.new_snapshot
+        # Call MR kernel on the adapter-owned entity map (updated in place,
+        # so only damaged entities are touched)
+        alerts = apply_damage_events(self.snapshot.entities, damage_events)
+        damage_events.clear()
+        self._spare_queue = damage_events
 
         # Convert MR alerts to engine-wide deltas
         deltas = []
-        for (entity_id, alert_type) in output.alerts:
+        for (entity_id, alert_type) in alerts:
             if alert_type == "died":
                 deltas.append(("behavior3d/set_flag", {
                     "entity": entity_id, 
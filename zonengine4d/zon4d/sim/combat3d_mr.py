@@ -2,13 +2,14 @@
 """
 Combat3D MR Kernel - Pure Functional Combat Logic
 
-Pure snapshot-in/snapshot-out combat processing.
-No side effects, no state mutation, no engine dependencies.
+Pure snapshot-in/snapshot-out combat processing (step_combat).
+No side effects, no state mutation, no engine dependencies; the only
+in-place entry point is apply_damage_events, for map-owning adapters.
 Handles damage application, death detection, and combat alerts.
 """
 
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -62,34 +63,88 @@ class CombatOutput:
     # examples: ("orc_12", "died"), ("player", "low_health")
 
 
-def step_combat(snapshot: CombatSnapshot, damage_events: List[DamageEvent]) -> CombatOutput:
+def apply_damage_events(
+    entities: Dict[str, CombatEntity],
+    damage_events: List[DamageEvent],
+) -> List[Tuple[str, str]]:
     """
-    Process all damage events for this tick and generate alerts.
+    Apply damage events to an entity map in place.
+    
+    For callers that own the map (the adapter); only targets whose state
+    changes are replaced, so the cost is O(damage events) rather than
+    O(entities). step_combat is the pure snapshot-in/snapshot-out wrapper.
     
     Args:
-        snapshot: Current combat world state
+        entities: entity_id -> CombatEntity, updated in place
         damage_events: All damage to apply this tick
         
     Returns:
-        CombatOutput with updated snapshot and combat alerts
+        Combat alerts in event order
     """
     alerts = []
-    new_entities = dict(snapshot.entities)
 
-    for evt in damage_events:
-        target = new_entities.get(evt.target_id)
-        if target is None:
-            continue
+    # Gather: per touched target, [entity, health, alive, low-health
+    # threshold] working values. Events update these scalars; each target
+    # is rebuilt once at the end instead of once per event.
+    touched = {}
 
-        updated = target.apply_damage(evt.amount)
-        new_entities[evt.target_id] = updated
+    for evt in damage_events:
+        work = touched.get(evt.target_id)
+        if work is None:
+            target = entities.get(evt.target_id)
+            if target is None:
+                continue
+            work = touched[evt.target_id] = [
+                target, target.health, target.alive, target.max_health * 0.25
+            ]
+
+        target, health, was_alive, low_health = work
+
+        # Same rules as CombatEntity.apply_damage (dead entities ignore damage)
+        if was_alive:
+            health = max(0.0, health - evt.amount)
+            work[1] = health
+            work[2] = health > 0.0
 
         # Alerts
-        if updated.alive is False and target.alive is True:
+        if was_alive and not work[2]:
             alerts.append((evt.target_id, "died"))
-        elif updated.health <= updated.max_health * 0.25:
+        elif health <= low_health:
             alerts.append((evt.target_id, "low_health"))
 
+    # Scatter: write back only the targets whose state changed
+    for target_id, (target, health, alive, _) in touched.items():
+        if health != target.health or alive != target.alive:
+            entities[target_id] = CombatEntity(
+                entity_id=target.entity_id,
+                health=health,
+                max_health=target.max_health,
+                alive=alive,
+                stagger_timer=target.stagger_timer,
+                invuln_timer=target.invuln_timer,
+            )
+
+    return alerts
+
+
+def step_combat(snapshot: CombatSnapshot, damage_events: List[DamageEvent]) -> CombatOutput:
+    """
+    Process all damage events for this tick and generate alerts.
+    
+    Args:
+        snapshot: Current combat world state
+        damage_events: All damage to apply this tick
+        
+    Returns:
+        CombatOutput with updated snapshot and combat alerts
+    """
+    if not damage_events:
+        # Nothing to apply: the input snapshot is already the result
+        return CombatOutput(new_snapshot=snapshot, alerts=[])
+
+    new_entities = dict(snapshot.entities)
+    alerts = apply_damage_events(new_entities, damage_events)
+
     return CombatOutput(
         new_snapshot=CombatSnapshot(entities=new_entities),
         alerts=alerts,
@@ -12,7 +12,9 @@ Architecture:
 - Emits deltas: path_request, path_ready, path_failed
 """
 
+import sys
 import time
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Any, Set
 from dataclasses import dataclass, field
 
@@ -50,10 +52,10 @@ except ImportError:
 
 # Import navigation kernel
 from navigation_mr import (
-    NavGrid, PathResult, Vec3,
+    NavGrid, PathResult, Vec3, SearchScratch,
     find_path, raycast,
-    create_empty_grid, add_obstacle_sphere,
-    world_to_grid, grid_to_world
+    create_empty_grid, obstacle_sphere_cells,
+    world_to_grid, grid_to_world, is_in_bounds, cell_index
 )
 
 
@@ -88,6 +90,7 @@ class NavigationStateView(BaseStateView):
     """
     
     DOMAIN = "navigation3d"
+    PATH_CACHE_SIZE = 1024  # Most recently used (start, goal, diagonal) results kept
     
     def __init__(self, state_slice: dict = None):
         if state_slice is None:
@@ -104,18 +107,30 @@ class NavigationStateView(BaseStateView):
         # Runtime state (not persisted)
         self._nav_grid: Optional[NavGrid] = None
         self._spatial_snapshot: Optional[Dict] = None
-        self._path_cache: Dict[Tuple[Vec3, Vec3], PathResult] = {}
+        self._path_cache: "OrderedDict[Tuple[int, int, bool], PathResult]" = OrderedDict()  # LRU, oldest first
         self._delta_counter = 0
+        
+        # Incremental NavGrid maintenance: obstacles already stamped into
+        # the working bitmap, with a per-cell count of obstacles blocking it
+        self._grid_params: Optional[Tuple[float, Vec3, Vec3]] = None
+        self._walkable_buf = bytearray()
+        self._obstacles: Dict[str, Tuple[Tuple[Vec3, float], List[int]]] = {}
+        self._block_counts: Dict[int, int] = {}
+        
+        # A* arrays shared by every request in a tick, sized to the grid
+        self._search_scratch: Optional[SearchScratch] = None
     
     # ========================================
     # SPATIAL3D INTEGRATION
     # ========================================
     
     def update_obstacles_from_spatial(self, spatial_snapshot: Dict[str, Any]):
-        """Rebuild NavGrid from Spatial3D state.
+        """Bring NavGrid up to date with Spatial3D state.
         
         Extracts entity positions/radii from spatial state and
-        creates NavGrid with obstacles.
+        creates NavGrid with obstacles. Only obstacles whose entity was
+        added, removed, moved or resized are re-stamped; the result is
+        the same grid a rebuild from scratch would give.
         """
         self._spatial_snapshot = spatial_snapshot
         
@@ -124,12 +139,21 @@ class NavigationStateView(BaseStateView):
         bounds_min = tuple(self._state_slice["grid_bounds_min"])
         bounds_max = tuple(self._state_slice["grid_bounds_max"])
         
-        # Create empty grid
-        grid = create_empty_grid(resolution, bounds_min, bounds_max)
+        # New grid geometry: start over from an empty grid
+        grid_params = (resolution, bounds_min, bounds_max)
+        if grid_params != self._grid_params or self._nav_grid is None:
+            empty_grid = create_empty_grid(resolution, bounds_min, bounds_max)
+            self._grid_params = grid_params
+            self._walkable_buf = bytearray(empty_grid.walkable)
+            self._obstacles.clear()
+            self._block_counts.clear()
+            self._nav_grid = empty_grid
+            self._search_scratch = SearchScratch(len(empty_grid.walkable))
+            self._path_cache.clear()
         
-        # Add obstacles from spatial entities
+        # Obstacles from spatial entities: (pos, radius) per solid entity
         entities = spatial_snapshot.get("spatial3d", {}).get("entities", {})
-        
+        wanted = {}
         for entity_id, entity_data in entities.items():
             # Only add solid entities as obstacles
             if not entity_data.get("solid", True):
@@ -137,14 +161,56 @@ class NavigationStateView(BaseStateView):
             
             pos = tuple(entity_data.get("pos", [0, 0, 0]))
             radius = entity_data.get("radius", 0.5)
-            
-            # Add obstacle (creates new immutable grid)
-            grid = add_obstacle_sphere(grid, pos, radius)
+            wanted[sys.intern(entity_id)] = (pos, radius)
+        
+        obstacles = self._obstacles
         
-        self._nav_grid = grid
+        # Footprints for new or changed obstacles, computed before any
+        # bookkeeping changes
+        stamped = {
+            entity_id: (key, obstacle_sphere_cells(self._nav_grid, key[0], key[1]))
+            for entity_id, key in wanted.items()
+            if entity_id not in obstacles or obstacles[entity_id][0] != key
+        }
+        stale = [
+            entity_id for entity_id, (key, _) in obstacles.items()
+            if wanted.get(entity_id) != key
+        ]
+        if not stamped and not stale:
+            return
         
-        # Clear path cache when obstacles change
-        self._path_cache.clear()
+        walkable = self._walkable_buf
+        block_counts = self._block_counts
+        
+        # Lift removed/changed obstacles; cells reopen once nothing blocks them
+        for entity_id in stale:
+            _, cells = obstacles.pop(entity_id)
+            for idx in cells:
+                count = block_counts[idx] - 1
+                if count:
+                    block_counts[idx] = count
+                else:
+                    del block_counts[idx]
+                    walkable[idx] = 1
+        
+        # Stamp new/changed obstacles
+        for entity_id, (key, cells) in stamped.items():
+            obstacles[entity_id] = (key, cells)
+            for idx in cells:
+                count = block_counts.get(idx, 0)
+                block_counts[idx] = count + 1
+                if not count:
+                    walkable[idx] = 0
+        
+        # Cached paths stay valid unless some cell actually changed
+        if walkable != self._nav_grid.walkable:
+            self._nav_grid = NavGrid(
+                resolution=resolution,
+                bounds_min=bounds_min,
+                bounds_max=bounds_max,
+                walkable=bytes(walkable)
+            )
+            self._path_cache.clear()
     
     # ========================================
     # PATH REQUEST API
@@ -164,6 +230,9 @@ class NavigationStateView(BaseStateView):
         Creates PathRequest and adds to active requests.
         Will be processed in next navigation_step().
         """
+        # Interned so the per-tick slice and obstacle lookups for this
+        # entity match by identity instead of comparing text
+        entity_id = sys.intern(entity_id)
         request = PathRequest(
             entity_id=entity_id,
             start=start,
@@ -185,6 +254,7 @@ class NavigationStateView(BaseStateView):
     
     def cancel_path(self, entity_id: str):
         """Cancel active path request for entity."""
+        entity_id = sys.intern(entity_id)
         self._state_slice["active_requests"].pop(entity_id, None)
         self._state_slice["active_paths"].pop(entity_id, None)
         self._state_slice["completed_paths"].pop(entity_id, None)
@@ -232,6 +302,7 @@ class NavigationStateView(BaseStateView):
         """
         deltas = []
         alerts = []
+        now = time.time()  # One wall-clock stamp for every alert this step
         
         # AP pre-validation
         valid, msg = self._validate_navigation_state(current_tick)
@@ -259,30 +330,40 @@ class NavigationStateView(BaseStateView):
                     step="navigation",
                     message=f"NavGrid not initialized for entity {entity_id}",
                     tick=current_tick,
-                    ts=time.time()
+                    ts=now
                 ))
                 continue
             
             # Check cache
-            cache_key = (request.start, request.goal)
-            if cache_key in self._path_cache:
-                result = self._path_cache[cache_key]
+            cache_key = self._path_cache_key(request)
+            result = self._path_cache.get(cache_key) if cache_key is not None else None
+            if result is not None:
+                self._path_cache.move_to_end(cache_key)
             else:
                 # Call mr kernel for pathfinding
                 result = find_path(
                     request.start,
                     request.goal,
                     self._nav_grid,
-                    allow_diagonal=request.allow_diagonal
+                    allow_diagonal=request.allow_diagonal,
+                    scratch=self._search_scratch
                 )
                 
-                # Cache result
-                self._path_cache[cache_key] = result
+                # Cache result, evicting the least recently used entry
+                if cache_key is not None:
+                    self._path_cache[cache_key] = result
+                    if len(self._path_cache) > self.PATH_CACHE_SIZE:
+                        self._path_cache.popitem(last=False)
+            
+            # Serialize the path once for the slice; the stored result and the
+            # active path share it. The delta payload leaves the adapter, so it
+            # gets its own copy
+            path_data = [list(p) for p in result.path]
             
             # Store result
             self._state_slice["completed_paths"][entity_id] = {
                 "success": result.success,
-                "path": [list(p) for p in result.path],
+                "path": path_data,
                 "cost": result.cost,
                 "nodes_explored": result.nodes_explored
             }
@@ -290,7 +371,7 @@ class NavigationStateView(BaseStateView):
             # Emit delta
             if result.success:
                 # Store active path
-                self._state_slice["active_paths"][entity_id] = [list(p) for p in result.path]
+                self._state_slice["active_paths"][entity_id] = path_data
                 
                 # Emit path_ready delta
                 delta = Delta(
@@ -313,7 +394,7 @@ class NavigationStateView(BaseStateView):
                     step="navigation",
                     message=f"Path found for {entity_id}: {len(result.path)} waypoints, cost {result.cost:.2f}",
                     tick=current_tick,
-                    ts=time.time(),
+                    ts=now,
                     payload={"nodes_explored": result.nodes_explored}
                 ))
             else:
@@ -338,7 +419,7 @@ class NavigationStateView(BaseStateView):
                     step="navigation",
                     message=f"No path found for {entity_id}",
                     tick=current_tick,
-                    ts=time.time()
+                    ts=now
                 ))
             
             # Mark request as processed
@@ -350,6 +431,23 @@ class NavigationStateView(BaseStateView):
         
         return deltas, alerts
     
+    def _path_cache_key(self, request: PathRequest) -> Optional[Tuple[int, int, bool]]:
+        """Cache key for a request: start/goal cell ids plus the move set.
+        
+        find_path only depends on the start and goal cells, except that
+        a same-cell request echoes the raw start; that case and
+        out-of-bounds requests return at once, so they are not cached
+        (None).
+        """
+        grid = self._nav_grid
+        start_cell = world_to_grid(request.start, grid.resolution, grid.bounds_min)
+        goal_cell = world_to_grid(request.goal, grid.resolution, grid.bounds_min)
+        if (start_cell == goal_cell
+                or not is_in_bounds(start_cell, grid) or not is_in_bounds(goal_cell, grid)):
+            return None
+        return (cell_index(start_cell, grid.dims), cell_index(goal_cell, grid.dims),
+                request.allow_diagonal)
+    
     # ========================================
     # AP CONSTRAINT VALIDATION
     # ========================================
@@ -362,28 +460,33 @@ class NavigationStateView(BaseStateView):
         2. Grid bounds must be valid
         3. Request ticks must not be in future
         """
-        # Check spatial snapshot exists
-        if self._spatial_snapshot is None and len(self._state_slice["active_requests"]) > 0:
-            return False, "No spatial snapshot available for navigation validation"
+        active_requests = self._state_slice["active_requests"]
         
-        # Validate each active request
-        if self._spatial_snapshot:
-            spatial_entities = self._spatial_snapshot.get("spatial3d", {}).get("entities", {})
+        # Request checks only apply when there are requests (most ticks have none)
+        if active_requests:
+            # Check spatial snapshot exists
+            if self._spatial_snapshot is None:
+                return False, "No spatial snapshot available for navigation validation"
             
-            for entity_id, request_data in self._state_slice["active_requests"].items():
-                # Check entity exists in spatial state
-                if entity_id not in spatial_entities:
-                    return False, f"Entity {entity_id} has path request but not in spatial state"
+            # Validate each active request
+            if self._spatial_snapshot:
+                spatial_entities = self._spatial_snapshot.get("spatial3d", {}).get("entities", {})
                 
-                # Check request tick
-                if request_data["request_tick"] > current_tick:
-                    return False, f"Entity {entity_id} has future request tick"
+                for entity_id, request_data in active_requests.items():
+                    # Check entity exists in spatial state
+                    if entity_id not in spatial_entities:
+                        return False, f"Entity {entity_id} has path request but not in spatial state"
+                    
+                    # Check request tick
+                    if request_data["request_tick"] > current_tick:
+                        return False, f"Entity {entity_id} has future request tick"
         
         # Validate grid bounds
         bounds_min = self._state_slice["grid_bounds_min"]
         bounds_max = self._state_slice["grid_bounds_max"]
         
-        if not all(bounds_max[i] > bounds_min[i] for i in range(3)):
+        if not (bounds_max[0] > bounds_min[0] and bounds_max[1] > bounds_min[1]
+                and bounds_max[2] > bounds_min[2]):
             return False, "Invalid grid bounds (max must be > min)"
         
         return True, ""
@@ -461,7 +564,7 @@ if __name__ == "__main__":
     print("TEST 1: Update NavGrid from spatial state")
     nav_view.update_obstacles_from_spatial(spatial_snapshot)
     print(f"  NavGrid created: {nav_view._nav_grid is not None}")
-    print(f"  Walkable cells: {len(nav_view._nav_grid.walkable_cells)}")
+    print(f"  Walkable cells: {nav_view._nav_grid.walkable_count}")
     print()
     
     # Request path
@@ -486,6 +589,10 @@ if __name__ == "__main__":
         print(f"  Delta type: {delta.type}")
         print(f"  Waypoints: {delta.payload.get('waypoints', 0)}")
         print(f"  Cost: {delta.payload.get('cost', 0):.2f}")
+        
+        # Consumers may edit the payload; the stored path must not follow
+        delta.payload["path"][0][0] = -1
+        assert nav_view.get_active_path("guard")[0][0] != -1, "Delta payload aliases the active path"
     print()
     
     # Query active path
@@ -530,4 +637,77 @@ if __name__ == "__main__":
         print(f"  Reason: {delta.payload.get('reason', 'unknown')}")
     print()
     
+    # Cached paths must respect the move set
+    print("TEST 7: Path cache keyed by move set (26-way then 6-way)")
+    from navigation_mr import add_obstacle_sphere
+    
+    small_slice = {
+        "active_requests": {}, "active_paths": {}, "completed_paths": {},
+        "grid_resolution": 1.0,
+        "grid_bounds_min": [-6.0, -2.0, -6.0],
+        "grid_bounds_max": [6.0, 2.0, 6.0],
+    }
+    movers = {
+        "a": {"pos": [0, 0, 0], "radius": 0.5, "solid": False},
+        "b": {"pos": [0, 0, 0], "radius": 0.5, "solid": False},
+    }
+    cache_view = NavigationStateView(dict(small_slice))
+    cache_view.update_obstacles_from_spatial({"spatial3d": {"entities": movers}})
+    cache_view.request_path("a", (-4.5, 0.5, -4.5), (3.5, 0.5, 4.5), 1, allow_diagonal=True)
+    cache_view.navigation_step(current_tick=1)
+    cache_view.request_path("b", (-4.5, 0.5, -4.5), (3.5, 0.5, 4.5), 2, allow_diagonal=False)
+    cache_view.navigation_step(current_tick=2)
+    
+    grid = cache_view._nav_grid
+    cells = [
+        world_to_grid(p, grid.resolution, grid.bounds_min)
+        for p in cache_view.get_path_result("b").path
+    ]
+    steps = [
+        sum(abs(c2[k] - c1[k]) for k in range(3))
+        for c1, c2 in zip(cells, cells[1:])
+    ]
+    diagonal_cells = [
+        world_to_grid(p, grid.resolution, grid.bounds_min)
+        for p in cache_view.get_path_result("a").path
+    ]
+    print(f"  26-way waypoints: {len(diagonal_cells)}, 6-way waypoints: {len(cells)}")
+    assert cache_view.get_path_result("b").success
+    assert steps and all(step == 1 for step in steps), "6-way request was served a diagonal path"
+    assert len(diagonal_cells) < len(cells)
+    print()
+    
+    # Incremental obstacle stamping must match a rebuild from scratch
+    print("TEST 8: Incremental NavGrid vs rebuild (add/move/resize/remove)")
+    
+    def rebuilt_walkable(entities):
+        grid = create_empty_grid(1.0, (-6.0, -2.0, -6.0), (6.0, 2.0, 6.0))
+        for data in entities.values():
+            if data.get("solid", True):
+                grid = add_obstacle_sphere(grid, tuple(data["pos"]), data.get("radius", 0.5))
+        return grid.walkable
+    
+    scenes = [
+        # Overlapping a/b share cells; d is not solid
+        {"a": {"pos": [0, 0, 0], "radius": 1.5}, "b": {"pos": [1, 0, 0], "radius": 1.5},
+         "c": {"pos": [-3, 0, 2], "radius": 1.0}, "d": {"pos": [3, 0, 3], "radius": 2.0, "solid": False}},
+        # Move a (still overlapping b)
+        {"a": {"pos": [0.5, 0, -1], "radius": 1.5}, "b": {"pos": [1, 0, 0], "radius": 1.5},
+         "c": {"pos": [-3, 0, 2], "radius": 1.0}, "d": {"pos": [3, 0, 3], "radius": 2.0, "solid": False}},
+        # Resize b over c; d becomes solid
+        {"a": {"pos": [0.5, 0, -1], "radius": 1.5}, "b": {"pos": [1, 0, 0], "radius": 2.5},
+         "c": {"pos": [-3, 0, 2], "radius": 1.0}, "d": {"pos": [3, 0, 3], "radius": 2.0}},
+        # Remove a and c
+        {"b": {"pos": [1, 0, 0], "radius": 2.5}, "d": {"pos": [3, 0, 3], "radius": 2.0}},
+        # Remove everything
+        {},
+    ]
+    grid_view = NavigationStateView(dict(small_slice))
+    for index, entities in enumerate(scenes):
+        grid_view.update_obstacles_from_spatial({"spatial3d": {"entities": entities}})
+        matches = grid_view._nav_grid.walkable == rebuilt_walkable(entities)
+        print(f"  Scene {index}: {grid_view._nav_grid.walkable_count} walkable, matches rebuild: {matches}")
+        assert matches, f"Incremental grid diverged from rebuild at scene {index}"
+    print()
+    
     print("✅ navigation_adapter tests complete")
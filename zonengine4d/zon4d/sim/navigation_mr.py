@@ -6,7 +6,7 @@ The "mr" (mathematics/rules) kernel for Navigation3D.
 Pure functional pathfinding: no state, no side effects, deterministic.
 
 Snapshot-in → path-out architecture:
-- NavGrid: Immutable grid data (resolution, bounds, walkable cells)
+- NavGrid: Immutable grid data (resolution, bounds, walkability bitmap)
 - find_path(): A* pathfinding over grid
 - raycast(): Grid-based line-of-sight check
 
@@ -36,12 +36,19 @@ class NavGrid:
     resolution: float  # Size of each grid cell in world units
     bounds_min: Vec3   # World-space minimum bounds
     bounds_max: Vec3   # World-space maximum bounds
-    walkable_cells: frozenset  # frozenset of GridCell tuples
+    walkable: bytes    # One byte per cell (nonzero = walkable), indexed by cell_index()
+    dims: GridCell = field(init=False, repr=False, compare=False)  # Cells per axis
     
     def __post_init__(self):
-        # Convert set to frozenset if needed (for immutability)
-        if not isinstance(self.walkable_cells, frozenset):
-            object.__setattr__(self, 'walkable_cells', frozenset(self.walkable_cells))
+        # Convert bytearray to bytes if needed (for immutability)
+        if not isinstance(self.walkable, bytes):
+            object.__setattr__(self, 'walkable', bytes(self.walkable))
+        object.__setattr__(self, 'dims', grid_dims(self.resolution, self.bounds_min, self.bounds_max))
+    
+    @property
+    def walkable_count(self) -> int:
+        """Number of walkable cells."""
+        return len(self.walkable) - self.walkable.count(0)
 
 
 @dataclass
@@ -53,6 +60,31 @@ class PathResult:
     nodes_explored: int
 
 
+@dataclass
+class SearchScratch:
+    """Reusable A* arrays for repeated searches on grids of one size.
+    
+    find_path puts every entry it touches back to its initial value
+    before returning (or raising), so one scratch serves any number of
+    searches in turn instead of each allocating per-cell arrays. A search
+    writes the arrays as it goes: one instance must not be shared across
+    threads.
+    """
+    num_cells: int
+    g_score: List[float] = field(init=False, repr=False)
+    came_from: List[int] = field(init=False, repr=False)
+    closed: bytearray = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Put every entry back to its initial value."""
+        self.g_score = [math.inf] * self.num_cells
+        self.came_from = [-1] * self.num_cells
+        self.closed = bytearray(self.num_cells)
+
+
 # ============================================================
 # GRID COORDINATE CONVERSION
 # ============================================================
@@ -73,14 +105,51 @@ def grid_to_world(cell: GridCell, resolution: float, bounds_min: Vec3) -> Vec3:
     return (x, y, z)
 
 
+def grid_dims(resolution: float, bounds_min: Vec3, bounds_max: Vec3) -> GridCell:
+    """Cells per axis for the given bounds (never negative)."""
+    return (
+        max(0, int((bounds_max[0] - bounds_min[0]) / resolution)),
+        max(0, int((bounds_max[1] - bounds_min[1]) / resolution)),
+        max(0, int((bounds_max[2] - bounds_min[2]) / resolution)),
+    )
+
+
+def cell_index(cell: GridCell, dims: GridCell) -> int:
+    """Flat index of an in-bounds cell in NavGrid.walkable (x-major)."""
+    return (cell[0] * dims[1] + cell[1]) * dims[2] + cell[2]
+
+
+def is_walkable(grid: NavGrid, cell: GridCell) -> bool:
+    """Check if grid cell is within bounds and walkable."""
+    x, y, z = cell
+    dims_x, dims_y, dims_z = grid.dims
+    return (0 <= x < dims_x and 0 <= y < dims_y and 0 <= z < dims_z
+            and grid.walkable[(x * dims_y + y) * dims_z + z] != 0)
+
+
+def cell_ids_to_world(cell_ids: List[int], grid: NavGrid) -> List[Vec3]:
+    """Convert flat cell indices to world-space cell centers.
+    
+    Same arithmetic as grid_to_world, with the grid constants hoisted out
+    of the per-waypoint loop.
+    """
+    res = grid.resolution
+    min_x, min_y, min_z = grid.bounds_min
+    dims_z = grid.dims[2]
+    plane = grid.dims[1] * dims_z
+    path = []
+    append = path.append
+    for idx in cell_ids:
+        x, rest = divmod(idx, plane)
+        y, z = divmod(rest, dims_z)
+        append((min_x + (x + 0.5) * res, min_y + (y + 0.5) * res, min_z + (z + 0.5) * res))
+    return path
+
+
 def is_in_bounds(cell: GridCell, grid: NavGrid) -> bool:
     """Check if grid cell is within grid bounds."""
     gx, gy, gz = cell
-    
-    # Calculate grid dimensions
-    dims_x = int((grid.bounds_max[0] - grid.bounds_min[0]) / grid.resolution)
-    dims_y = int((grid.bounds_max[1] - grid.bounds_min[1]) / grid.resolution)
-    dims_z = int((grid.bounds_max[2] - grid.bounds_min[2]) / grid.resolution)
+    dims_x, dims_y, dims_z = grid.dims  # Computed once per grid
     
     return (0 <= gx < dims_x and 
             0 <= gy < dims_y and 
@@ -131,6 +200,18 @@ def get_neighbors_26way(cell: GridCell) -> List[GridCell]:
     return neighbors
 
 
+# Neighbor steps as (dx, dy, dz, move cost), in the same order as
+# get_neighbors_6way/get_neighbors_26way so searches expand identically
+NEIGHBOR_OFFSETS_6 = tuple(
+    (dx, dy, dz, math.sqrt(dx*dx + dy*dy + dz*dz))
+    for dx, dy, dz in get_neighbors_6way((0, 0, 0))
+)
+NEIGHBOR_OFFSETS_26 = tuple(
+    (dx, dy, dz, math.sqrt(dx*dx + dy*dy + dz*dz))
+    for dx, dy, dz in get_neighbors_26way((0, 0, 0))
+)
+
+
 # ============================================================
 # A* PATHFINDING
 # ============================================================
@@ -139,7 +220,8 @@ def find_path(
     start: Vec3,
     goal: Vec3,
     grid: NavGrid,
-    allow_diagonal: bool = True
+    allow_diagonal: bool = True,
+    scratch: Optional[SearchScratch] = None
 ) -> PathResult:
     """A* pathfinding from start to goal on grid.
     
@@ -153,6 +235,9 @@ def find_path(
         goal: World-space goal position
         grid: Immutable navigation grid
         allow_diagonal: If True, allow 26-way movement, else 6-way
+        scratch: Optional per-cell arrays to reuse across searches on
+            grids with the same cell count (ignored if the size differs).
+            Without one, each search allocates its own O(cells) arrays
         
     Returns:
         PathResult with success flag, path waypoints, cost, and stats
@@ -165,83 +250,265 @@ def find_path(
     if not is_in_bounds(start_cell, grid) or not is_in_bounds(goal_cell, grid):
         return PathResult(success=False, path=[], cost=0.0, nodes_explored=0)
     
-    if start_cell not in grid.walkable_cells or goal_cell not in grid.walkable_cells:
+    if not is_walkable(grid, start_cell) or not is_walkable(grid, goal_cell):
         return PathResult(success=False, path=[], cost=0.0, nodes_explored=0)
     
     # Early exit if start == goal
     if start_cell == goal_cell:
         return PathResult(success=True, path=[start], cost=0.0, nodes_explored=1)
     
-    # A* data structures
-    open_set = []  # Priority queue: (f_score, counter, cell)
+    # A* data structures, flat over linearized cell ids (see cell_index)
+    walkable = grid.walkable
+    dims_x, dims_y, dims_z = grid.dims
+    num_cells = len(walkable)
+    start_idx = cell_index(start_cell, grid.dims)
+    goal_idx = cell_index(goal_cell, grid.dims)
+    
+    plane = dims_y * dims_z
+    goal_x, goal_y, goal_z = goal_cell
+    offsets = NEIGHBOR_OFFSETS_26 if allow_diagonal else NEIGHBOR_OFFSETS_6
+    
+    # A throwaway scratch is dropped after the search, so it is not reset
+    reusable = scratch is not None and scratch.num_cells == num_cells
+    if not reusable:
+        scratch = SearchScratch(num_cells)
+    came_from = scratch.came_from  # cell id → parent cell id (-1 = none)
+    g_score = scratch.g_score  # cell id → cost from start
+    closed = scratch.closed  # cell id → 1 once expanded
+    
+    open_set = []  # Priority queue: (f_score, counter, cell id)
     counter = 0  # Tie-breaker for heap
-    came_from = {}  # cell → parent cell
-    g_score = {start_cell: 0.0}  # cell → cost from start
-    f_score = {start_cell: euclidean_distance(start_cell, goal_cell)}  # cell → estimated total cost
-    
-    heapq.heappush(open_set, (f_score[start_cell], counter, start_cell))
-    counter += 1
     
-    closed_set = set()
+    # Every cell given a g_score is either expanded or still queued, so
+    # these two are all that must be reset for the scratch to be reused
+    expanded = []
     nodes_explored = 0
     
-    # A* main loop
-    while open_set:
-        _, _, current = heapq.heappop(open_set)
-        
-        if current in closed_set:
-            continue
+    try:
+        # came_from is only read along the chain built by this search, so
+        # the start's entry is the only one that must be cleared up front
+        came_from[start_idx] = -1
+        g_score[start_idx] = 0.0
+        heapq.heappush(open_set, (euclidean_distance(start_cell, goal_cell), counter, start_idx))
+        counter += 1
         
-        closed_set.add(current)
-        nodes_explored += 1
-        
-        # Goal check
-        if current == goal_cell:
-            # Reconstruct path
-            path_cells = []
-            cell = current
-            while cell in came_from:
-                path_cells.append(cell)
-                cell = came_from[cell]
-            path_cells.append(start_cell)
-            path_cells.reverse()
+        # A* main loop
+        while open_set:
+            _, _, current_idx = heapq.heappop(open_set)
             
-            # Convert to world coordinates
-            path_world = [grid_to_world(c, grid.resolution, grid.bounds_min) for c in path_cells]
+            if closed[current_idx]:
+                continue
             
-            return PathResult(
-                success=True,
-                path=path_world,
-                cost=g_score[current],
-                nodes_explored=nodes_explored
-            )
+            closed[current_idx] = 1
+            expanded.append(current_idx)
+            nodes_explored += 1
+            
+            # Goal check
+            if current_idx == goal_idx:
+                # Reconstruct path
+                path_ids = []
+                idx = current_idx
+                while idx != -1:
+                    path_ids.append(idx)
+                    idx = came_from[idx]
+                path_ids.reverse()
+                
+                return PathResult(
+                    success=True,
+                    path=cell_ids_to_world(path_ids, grid),
+                    cost=g_score[current_idx],
+                    nodes_explored=nodes_explored
+                )
+            
+            # Explore neighbors: offsets from the current cell's coordinates,
+            # so no cell tuple is built per neighbor
+            cx, rest = divmod(current_idx, plane)
+            cy, cz = divmod(rest, dims_z)
+            current_g = g_score[current_idx]
+            
+            for dx, dy, dz, move_cost in offsets:
+                # Check bounds and walkability (one bitmap load)
+                nx = cx + dx
+                ny = cy + dy
+                nz = cz + dz
+                if not (0 <= nx < dims_x and 0 <= ny < dims_y and 0 <= nz < dims_z):
+                    continue
+                neighbor_idx = (nx * dims_y + ny) * dims_z + nz
+                if not walkable[neighbor_idx] or closed[neighbor_idx]:
+                    continue
+                
+                tentative_g = current_g + move_cost
+                
+                # Check if this path is better (unvisited cells hold inf)
+                if tentative_g < g_score[neighbor_idx]:
+                    came_from[neighbor_idx] = current_idx
+                    g_score[neighbor_idx] = tentative_g
+                    hx = nx - goal_x
+                    hy = ny - goal_y
+                    hz = nz - goal_z
+                    f_score = tentative_g + math.sqrt(hx*hx + hy*hy + hz*hz)
+                    heapq.heappush(open_set, (f_score, counter, neighbor_idx))
+                    counter += 1
         
-        # Explore neighbors
-        neighbors = get_neighbors_26way(current) if allow_diagonal else get_neighbors_6way(current)
+        # No path found
+        return PathResult(success=False, path=[], cost=0.0, nodes_explored=nodes_explored)
+    except BaseException:
+        # Interrupted mid-search (KeyboardInterrupt, MemoryError, ...):
+        # which cells were touched is not tracked reliably at an arbitrary
+        # point, so every entry goes back to its initial value
+        if reusable:
+            scratch.reset()
+            reusable = False
+        raise
+    finally:
+        if reusable:
+            _reset_scratch(scratch, expanded, open_set)
+
+
+def _reset_scratch(scratch: SearchScratch, expanded: List[int], open_set: list):
+    """Return the cells a search touched to their initial scratch values."""
+    g_score = scratch.g_score
+    closed = scratch.closed
+    inf = math.inf
+    for idx in expanded:
+        g_score[idx] = inf
+        closed[idx] = 0
+    for _, _, idx in open_set:
+        g_score[idx] = inf
+
+
+def find_path_bidirectional(
+    start: Vec3,
+    goal: Vec3,
+    grid: NavGrid,
+    allow_diagonal: bool = True
+) -> PathResult:
+    """Bidirectional A*: searches from start and goal until they meet.
+    
+    Same contract as find_path and the same optimal cost, usually with
+    fewer expansions when both ends are boxed in by walls. Among
+    equal-cost routes it may pick a different one than find_path, and
+    nodes_explored counts both searches.
+    
+    The searches alternate and use the balanced heuristic
+    ±(h(n, goal) - h(n, start)) / 2, which keeps both consistent; with
+    it the search can stop as soon as the two frontiers' smallest keys
+    sum to at least the best meeting cost seen.
+    """
+    # Convert to grid coordinates
+    start_cell = world_to_grid(start, grid.resolution, grid.bounds_min)
+    goal_cell = world_to_grid(goal, grid.resolution, grid.bounds_min)
+    
+    # Check if start/goal are valid
+    if not is_walkable(grid, start_cell) or not is_walkable(grid, goal_cell):
+        return PathResult(success=False, path=[], cost=0.0, nodes_explored=0)
+    
+    # Early exit if start == goal
+    if start_cell == goal_cell:
+        return PathResult(success=True, path=[start], cost=0.0, nodes_explored=1)
+    
+    walkable = grid.walkable
+    dims_x, dims_y, dims_z = grid.dims
+    num_cells = len(walkable)
+    start_idx = cell_index(start_cell, grid.dims)
+    goal_idx = cell_index(goal_cell, grid.dims)
+    
+    plane = dims_y * dims_z
+    offsets = NEIGHBOR_OFFSETS_26 if allow_diagonal else NEIGHBOR_OFFSETS_6
+    
+    # Per direction (0 = from start, 1 = from goal): open heap of
+    # (key, counter, cell id), came_from, g_score, closed flags, and the
+    # (toward, away) cells of its half of the heuristic
+    half_span = euclidean_distance(start_cell, goal_cell) * 0.5
+    open_sets = ([(half_span, 0, start_idx)],
+                 [(half_span, 1, goal_idx)])
+    came_froms = ([-1] * num_cells, [-1] * num_cells)
+    g_scores = ([math.inf] * num_cells, [math.inf] * num_cells)
+    g_scores[0][start_idx] = 0.0
+    g_scores[1][goal_idx] = 0.0
+    closeds = (bytearray(num_cells), bytearray(num_cells))
+    ends = ((goal_cell, start_cell), (start_cell, goal_cell))
+    counter = 2  # Tie-breaker shared by both heaps
+    
+    best_cost = math.inf  # Cheapest complete route seen so far
+    meet_idx = -1         # Cell where that route's two halves join
+    nodes_explored = 0
+    side = 1
+    
+    while True:
+        # Drop entries for cells each side has already expanded
+        for open_set, closed in zip(open_sets, closeds):
+            while open_set and closed[open_set[0][2]]:
+                heapq.heappop(open_set)
         
-        for neighbor in neighbors:
-            # Check bounds and walkability
-            if not is_in_bounds(neighbor, grid):
-                continue
-            if neighbor not in grid.walkable_cells:
+        if not open_sets[0] or not open_sets[1]:
+            break
+        if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+            break
+        
+        side = 1 - side
+        open_set = open_sets[side]
+        came_from = came_froms[side]
+        g_score = g_scores[side]
+        other_g = g_scores[1 - side]
+        closed = closeds[side]
+        (tx, ty, tz), (ax, ay, az) = ends[side]
+        
+        _, _, current_idx = heapq.heappop(open_set)
+        closed[current_idx] = 1
+        nodes_explored += 1
+        current_g = g_score[current_idx]
+        cx, rest = divmod(current_idx, plane)
+        cy, cz = divmod(rest, dims_z)
+        
+        for dx, dy, dz, move_cost in offsets:
+            nx = cx + dx
+            ny = cy + dy
+            nz = cz + dz
+            if not (0 <= nx < dims_x and 0 <= ny < dims_y and 0 <= nz < dims_z):
                 continue
-            if neighbor in closed_set:
+            neighbor_idx = (nx * dims_y + ny) * dims_z + nz
+            if not walkable[neighbor_idx] or closed[neighbor_idx]:
                 continue
             
-            # Calculate movement cost
-            move_cost = euclidean_distance(current, neighbor)
-            tentative_g = g_score[current] + move_cost
-            
-            # Check if this path is better
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + euclidean_distance(neighbor, goal_cell)
-                heapq.heappush(open_set, (f_score[neighbor], counter, neighbor))
+            tentative_g = current_g + move_cost
+            if tentative_g < g_score[neighbor_idx]:
+                came_from[neighbor_idx] = current_idx
+                g_score[neighbor_idx] = tentative_g
+                key = tentative_g + 0.5 * (
+                    math.sqrt((nx - tx)**2 + (ny - ty)**2 + (nz - tz)**2)
+                    - math.sqrt((nx - ax)**2 + (ny - ay)**2 + (nz - az)**2))
+                heapq.heappush(open_set, (key, counter, neighbor_idx))
                 counter += 1
-    
-    # No path found
-    return PathResult(success=False, path=[], cost=0.0, nodes_explored=nodes_explored)
+                
+                # Reached by the other search too: a complete route
+                route_cost = tentative_g + other_g[neighbor_idx]
+                if route_cost < best_cost:
+                    best_cost = route_cost
+                    meet_idx = neighbor_idx
+    
+    if meet_idx == -1:
+        # No path found
+        return PathResult(success=False, path=[], cost=0.0, nodes_explored=nodes_explored)
+    
+    # Reconstruct path: start → meeting cell, then on to the goal
+    path_ids = []
+    idx = meet_idx
+    while idx != -1:
+        path_ids.append(idx)
+        idx = came_froms[0][idx]
+    path_ids.reverse()
+    idx = came_froms[1][meet_idx]
+    while idx != -1:
+        path_ids.append(idx)
+        idx = came_froms[1][idx]
+    
+    return PathResult(
+        success=True,
+        path=cell_ids_to_world(path_ids, grid),
+        cost=best_cost,
+        nodes_explored=nodes_explored
+    )
 
 
 # ============================================================
@@ -292,41 +559,55 @@ def raycast(start: Vec3, end: Vec3, grid: NavGrid) -> bool:
     dy *= 2
     dz *= 2
     
+    # Track the flat cell index alongside the coordinates so each step is
+    # one bytes lookup; the coordinates are still needed for the bounds test
+    walkable = grid.walkable
+    dims_x, dims_y, dims_z = grid.dims
+    x_step = x_inc * dims_y * dims_z
+    y_step = y_inc * dims_z
+    z_step = z_inc
+    idx = (x * dims_y + y) * dims_z + z
+    end_idx = (x1 * dims_y + y1) * dims_z + z1
+    
     for _ in range(n):
-        current_cell = (x, y, z)
-        
         # Check if current cell is walkable
-        if current_cell not in grid.walkable_cells:
+        if not (0 <= x < dims_x and 0 <= y < dims_y and 0 <= z < dims_z) or not walkable[idx]:
             return False  # Blocked
         
-        if (x, y, z) == end_cell:
+        if idx == end_idx:
             return True  # Reached end
         
         # DDA step
         if error_xy > 0 and error_xz > 0:
             x += x_inc
+            idx += x_step
             error_xy -= dy
             error_xz -= dz
         elif error_xy > 0 and error_yz > 0:
             y += y_inc
+            idx += y_step
             error_xy += dx
             error_yz -= dz
         elif error_xz > 0 and error_yz < 0:
             z += z_inc
+            idx += z_step
             error_xz += dx
             error_yz += dy
         else:
             # Tie-break - move along axis with largest delta
             if dx >= dy and dx >= dz:
                 x += x_inc
+                idx += x_step
                 error_xy -= dy
                 error_xz -= dz
             elif dy >= dx and dy >= dz:
                 y += y_inc
+                idx += y_step
                 error_xy += dx
                 error_yz -= dz
             else:
                 z += z_inc
+                idx += z_step
                 error_xz += dx
                 error_yz += dy
     
@@ -343,26 +624,64 @@ def create_empty_grid(
     bounds_max: Vec3
 ) -> NavGrid:
     """Create an empty navigation grid (all cells walkable)."""
-    # Calculate dimensions
-    dims_x = int((bounds_max[0] - bounds_min[0]) / resolution)
-    dims_y = int((bounds_max[1] - bounds_min[1]) / resolution)
-    dims_z = int((bounds_max[2] - bounds_min[2]) / resolution)
-    
-    # Create all cells
-    walkable = set()
-    for x in range(dims_x):
-        for y in range(dims_y):
-            for z in range(dims_z):
-                walkable.add((x, y, z))
+    dims_x, dims_y, dims_z = grid_dims(resolution, bounds_min, bounds_max)
     
     return NavGrid(
         resolution=resolution,
         bounds_min=bounds_min,
         bounds_max=bounds_max,
-        walkable_cells=frozenset(walkable)
+        walkable=b"\x01" * (dims_x * dims_y * dims_z)
     )
 
 
+def obstacle_sphere_cells(
+    grid: NavGrid,
+    center: Vec3,
+    radius: float
+) -> List[int]:
+    """Cell ids (see cell_index) of the in-bounds cells a sphere blocks.
+    
+    A cell is blocked when its center lies inside the sphere. Only the
+    grid's geometry (resolution, bounds, dims) is used.
+    """
+    center_cell = world_to_grid(center, grid.resolution, grid.bounds_min)
+    radius_cells = int(radius / grid.resolution) + 1
+    
+    resolution = grid.resolution
+    bounds_min = grid.bounds_min
+    dims = grid.dims
+    radius_sq = radius * radius
+    
+    # Per axis: the in-bounds cell range of the sphere's bbox and each
+    # cell center's squared offset from the sphere center (same terms
+    # grid_to_world gives), so the inner loop only adds and compares
+    ranges = []
+    offsets_sq = []
+    for axis in range(3):
+        lo = max(center_cell[axis] - radius_cells, 0)
+        hi = min(center_cell[axis] + radius_cells + 1, dims[axis])
+        ranges.append(range(lo, hi))
+        offsets_sq.append([
+            (bounds_min[axis] + (c + 0.5) * resolution - center[axis])**2
+            for c in range(lo, hi)
+        ])
+    range_x, range_y, range_z = ranges
+    ox_sq, oy_sq, oz_sq = offsets_sq
+    z_lo = range_z.start
+    
+    cells = []
+    for x, dx_sq in zip(range_x, ox_sq):
+        for y, dy_sq in zip(range_y, oy_sq):
+            dxy_sq = dx_sq + dy_sq
+            if dxy_sq > radius_sq:
+                continue  # adding a (non-negative) z term cannot bring it back
+            row = (x * dims[1] + y) * dims[2]
+            for z, dz_sq in enumerate(oz_sq, z_lo):
+                if dxy_sq + dz_sq <= radius_sq:
+                    cells.append(row + z)
+    return cells
+
+
 def add_obstacle_sphere(
     grid: NavGrid,
     center: Vec3,
@@ -372,29 +691,31 @@ def add_obstacle_sphere(
     
     Returns new NavGrid with cells inside sphere marked as blocked.
     """
-    center_cell = world_to_grid(center, grid.resolution, grid.bounds_min)
-    radius_cells = int(radius / grid.resolution) + 1
+    return add_obstacle_spheres(grid, [(center, radius)])
+
+
+def add_obstacle_spheres(
+    grid: NavGrid,
+    obstacles: List[Tuple[Vec3, float]]
+) -> NavGrid:
+    """Create new grid with several sphere obstacles removed.
     
-    new_walkable = set(grid.walkable_cells)
+    Same result as chaining add_obstacle_sphere over (center, radius)
+    pairs, but stamps them all into one staging bitmap and freezes it
+    once instead of copying the whole grid per obstacle.
+    """
+    new_walkable = bytearray(grid.walkable)
     
-    # Remove cells within sphere
-    for dx in range(-radius_cells, radius_cells + 1):
-        for dy in range(-radius_cells, radius_cells + 1):
-            for dz in range(-radius_cells, radius_cells + 1):
-                cell = (center_cell[0] + dx, center_cell[1] + dy, center_cell[2] + dz)
-                
-                # Check if cell center is within sphere
-                cell_world = grid_to_world(cell, grid.resolution, grid.bounds_min)
-                dist_sq = sum((cell_world[i] - center[i])**2 for i in range(3))
-                
-                if dist_sq <= radius * radius:
-                    new_walkable.discard(cell)
+    # Remove cells within each sphere
+    for center, radius in obstacles:
+        for idx in obstacle_sphere_cells(grid, center, radius):
+            new_walkable[idx] = 0
     
     return NavGrid(
         resolution=grid.resolution,
         bounds_min=grid.bounds_min,
         bounds_max=grid.bounds_max,
-        walkable_cells=frozenset(new_walkable)
+        walkable=bytes(new_walkable)
     )
 
 
@@ -413,7 +734,7 @@ if __name__ == "__main__":
         bounds_max=(10.0, 10.0, 10.0)
     )
     
-    print(f"Grid: {len(grid.walkable_cells)} walkable cells")
+    print(f"Grid: {grid.walkable_count} walkable cells")
     print()
     
     # Test 1: Simple path
@@ -428,7 +749,7 @@ if __name__ == "__main__":
     # Test 2: Path with obstacle
     print("TEST 2: Path around obstacle")
     grid_with_wall = add_obstacle_sphere(grid, (5.0, 0.0, 0.0), 1.5)
-    print(f"  Grid after obstacle: {len(grid_with_wall.walkable_cells)} walkable cells")
+    print(f"  Grid after obstacle: {grid_with_wall.walkable_count} walkable cells")
     
     result = find_path((0.5, 0.5, 0.5), (9.5, 0.5, 0.5), grid_with_wall)
     print(f"  Success: {result.success}")
@@ -454,4 +775,44 @@ if __name__ == "__main__":
     print(f"  Path: {result.path}")
     print()
     
+    # Test 5: Bidirectional search against find_path on random grids
+    print("TEST 5: find_path_bidirectional vs find_path (random grids)")
+    import random
+    rng = random.Random(7)
+    queries = 0
+    found = 0
+    for _ in range(60):
+        test_grid = create_empty_grid(1.0, (0.0, 0.0, 0.0), (rng.randint(4, 12), rng.randint(1, 4), rng.randint(4, 12)))
+        bounds = test_grid.bounds_max
+        test_grid = add_obstacle_spheres(test_grid, [
+            ((rng.uniform(0, bounds[0]), rng.uniform(0, bounds[1]), rng.uniform(0, bounds[2])), rng.uniform(0.5, 2.0))
+            for _ in range(rng.randint(0, 8))
+        ])
+        for _ in range(10):
+            start = (rng.uniform(0, bounds[0]), rng.uniform(0, bounds[1]), rng.uniform(0, bounds[2]))
+            goal = (rng.uniform(0, bounds[0]), rng.uniform(0, bounds[1]), rng.uniform(0, bounds[2]))
+            for diagonal in (False, True):
+                forward = find_path(start, goal, test_grid, allow_diagonal=diagonal)
+                both = find_path_bidirectional(start, goal, test_grid, allow_diagonal=diagonal)
+                queries += 1
+                assert both.success == forward.success, (start, goal, diagonal)
+                if not both.success:
+                    continue
+                found += 1
+                assert abs(both.cost - forward.cost) < 1e-9, (start, goal, diagonal)
+                
+                # Walkable, connected by legal moves, and priced as reported
+                cells = [world_to_grid(p, test_grid.resolution, test_grid.bounds_min) for p in both.path]
+                assert cells[0] == world_to_grid(start, test_grid.resolution, test_grid.bounds_min)
+                assert cells[-1] == world_to_grid(goal, test_grid.resolution, test_grid.bounds_min)
+                assert all(is_walkable(test_grid, c) for c in cells)
+                max_step = 3 if diagonal else 1
+                steps = [manhattan_distance(a, b) for a, b in zip(cells, cells[1:])]
+                assert all(1 <= step <= max_step and max(abs(a[k] - b[k]) for k in range(3)) == 1
+                           for step, (a, b) in zip(steps, zip(cells, cells[1:])))
+                path_cost = sum(euclidean_distance(a, b) for a, b in zip(cells, cells[1:]))
+                assert abs(path_cost - both.cost) < 1e-9, (start, goal, diagonal)
+    print(f"  Queries: {queries}, paths found: {found}, all consistent")
+    print()
+    
     print("✅ navigation_mr kernel tests complete")
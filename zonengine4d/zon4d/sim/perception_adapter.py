@@ -11,10 +11,20 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import time
+from concurrent.futures import Executor
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional, Any
 
 from perception_mr import step_perception
 
+# Shared read-only stand-in for a missing perceiver/memory table in the
+# query methods (saves allocating a throwaway {} per lookup)
+_EMPTY = MappingProxyType({})
+
+# Delta constants, bound once at import rather than rebuilt per delta
+_DELTA_TYPE_PREFIX = "perception/"
+_DELTA_PRIORITY = 10  # Higher priority than spatial tasks
+
 try:
     from ENGINALITY.state.domain_views import BaseStateView
     from ENGINALITY.alerts import Alert
@@ -29,7 +39,7 @@ except ImportError:
     from dataclasses import dataclass
     from typing import Any, Dict as TDict, List as TList
     
-    @dataclass
+    @dataclass(slots=True)
     class Alert:
         level: str
         step: int
@@ -42,7 +52,7 @@ except ImportError:
             if self.payload is None:
                 self.payload = {}
     
-    @dataclass 
+    @dataclass(slots=True)
     class Delta:
         id: str
         type: str
@@ -79,14 +89,31 @@ class PerceptionStateView(BaseStateView):
     
     DOMAIN = "perception"
     
-    def __init__(self, state_slice: dict):
+    def __init__(self, state_slice: dict, executor: Optional[Executor] = None, strict: bool = True):
         super().__init__(state_slice)
         self._spatial_state: Dict[str, Any] = {}
+        self._spatial_entities: Dict[str, Any] = {}  # entity_id → data, resolved once per spatial update
         self._sound_events: List[Dict[str, Any]] = []
+        
+        # Optional executor for the per-perceiver kernel pass. Only useful
+        # when the kernel can run without the GIL (e.g. free-threaded builds).
+        self._executor = executor
+        
+        # Memory timestamp/certainty checks in the validator. Callers that
+        # trust the kernel can pass strict=False to skip them; the kernel
+        # does not guarantee them (loud sounds push certainty past 1, a
+        # rewound tick leaves future timestamps)
+        self._strict = strict
     
     def set_spatial_state(self, spatial_state: dict):
         """Called by runtime to provide current spatial state."""
         self._spatial_state = spatial_state
+        # Re-keyed with interned ids: the kernel interns the ids it emits,
+        # so the validator's membership probes match by identity
+        self._spatial_entities = {
+            sys.intern(eid): data
+            for eid, data in spatial_state.get("spatial3d", {}).get("entities", {}).items()
+        }
     
     def handle_sound_event(self, sound_event: dict):
         """Queue sound event for next perception step."""
@@ -100,8 +127,10 @@ class PerceptionStateView(BaseStateView):
             deltas: Perception event deltas
             alerts: Runtime alerts
         """
-        # Save old state for rollback
-        old_state = self._state_slice.copy()
+        # Save old state for rollback. The kernel builds a fresh state dict
+        # and never mutates its input, so holding the current slice is
+        # enough; no copy is needed
+        old_state = self._state_slice
         
         # Run mr kernel
         try:
@@ -110,10 +139,10 @@ class PerceptionStateView(BaseStateView):
                 self._state_slice,
                 current_tick,
                 self._sound_events,
+                executor=self._executor,
             )
         except Exception as e:
-            # Kernel error - rollback
-            self._state_slice = old_state
+            # Kernel error - state was never replaced, nothing to roll back
             raise APViolation(f"Perception kernel error: {e}")
         
         # Update state
@@ -130,11 +159,11 @@ class PerceptionStateView(BaseStateView):
             raise APViolation(f"Perception AP violation: {msg}")
         
         # Convert mr deltas to ZON4D deltas
-        deltas = []
-        for mr_delta in mr_deltas:
-            deltas.append(Delta(
-                id=f"perception_{mr_delta['type']}_{mr_delta['perceiver_id']}_{mr_delta['target_id']}@{current_tick}",
-                type=f"perception/{mr_delta['type']}",
+        tick_suffix = f"@{current_tick}"
+        deltas = [
+            Delta(
+                id=f"perception_{mr_delta['type']}_{mr_delta['perceiver_id']}_{mr_delta['target_id']}{tick_suffix}",
+                type=_DELTA_TYPE_PREFIX + mr_delta["type"],
                 payload={
                     "perceiver_id": mr_delta["perceiver_id"],
                     "target_id": mr_delta["target_id"],
@@ -142,43 +171,48 @@ class PerceptionStateView(BaseStateView):
                     **mr_delta.get("data", {})
                 },
                 tags=["perception"],
-                priority=10,  # Higher priority than spatial tasks
-            ))
+                priority=_DELTA_PRIORITY,
+            )
+            for mr_delta in mr_deltas
+        ]
         
-        # Convert mr alerts to runtime alerts
-        alerts = []
-        for mr_alert in mr_alerts:
-            alerts.append(Alert(
+        # Convert mr alerts to runtime alerts. They all come from the same
+        # kernel call, so they share one wall-clock stamp
+        now = time.time()
+        alerts = [
+            Alert(
                 level=mr_alert["level"],
                 step=0,
                 message=f"[PERCEPTION] {mr_alert['code']}: {mr_alert['message']}",
                 tick=current_tick,
-                ts=time.time(),
+                ts=now,
                 payload={"entity_ids": mr_alert["entity_ids"]}
-            ))
+            )
+            for mr_alert in mr_alerts
+        ]
         
         return deltas, alerts
     
     def get_visible_entities(self, perceiver_id: str) -> List[str]:
         """Query: Get entities currently visible to perceiver."""
-        state = self._state_slice.get(perceiver_id, {})
+        state = self._state_slice.get(perceiver_id, _EMPTY)
         return state.get("visible_now", [])
     
     def get_audible_entities(self, perceiver_id: str) -> List[str]:
         """Query: Get entities currently audible to perceiver."""
-        state = self._state_slice.get(perceiver_id, {})
+        state = self._state_slice.get(perceiver_id, _EMPTY)
         return state.get("audible_now", [])
     
     def get_memory(self, perceiver_id: str, target_id: str) -> Optional[Dict[str, Any]]:
         """Query: Get memory of target entity."""
-        state = self._state_slice.get(perceiver_id, {})
-        memories = state.get("memories", {})
+        state = self._state_slice.get(perceiver_id, _EMPTY)
+        memories = state.get("memories", _EMPTY)
         return memories.get(target_id)
     
     def get_all_memories(self, perceiver_id: str) -> Dict[str, Dict[str, Any]]:
         """Query: Get all memories for perceiver."""
-        state = self._state_slice.get(perceiver_id, {})
-        return state.get("memories", {}).copy()
+        state = self._state_slice.get(perceiver_id, _EMPTY)
+        return state.get("memories", _EMPTY).copy()  # Always a fresh dict
     
     def _validate_perception_state(self, current_tick: int) -> Tuple[bool, str]:
         """
@@ -189,9 +223,12 @@ class PerceptionStateView(BaseStateView):
         2. All remembered entities must exist in spatial state
         3. Memory timestamps cannot be in the future
         4. Certainty must be between 0 and 1
+        
+        Rules 1-2 are cross-domain and always checked; rules 3-4 only
+        in strict mode (the default).
         """
-        # Get spatial entities
-        spatial_entities = self._spatial_state.get("spatial3d", {}).get("entities", {})
+        spatial_entities = self._spatial_entities
+        strict = self._strict
         
         for perceiver_id, state_data in self._state_slice.items():
             # Check perceiver exists
@@ -215,6 +252,9 @@ class PerceptionStateView(BaseStateView):
                 if target_id not in spatial_entities:
                     return False, f"Remembered entity {target_id} not in spatial state"
                 
+                if not strict:
+                    continue
+                
                 # Timestamp validation
                 last_seen = memory.get("last_seen_tick", 0)
                 last_heard = memory.get("last_heard_tick", 0)
@@ -6,13 +6,15 @@ Deterministic, engine-agnostic, snapshot-in/snapshot-out.
 
 from __future__ import annotations
 from dataclasses import dataclass, field
+from concurrent.futures import Executor
 from typing import Dict, List, Tuple, Set, Optional, Any
 import math
+import sys
 
 Vec3 = Tuple[float, float, float]
 
 
-@dataclass
+@dataclass(slots=True)
 class PerceptionEntity:
     """Entity data needed for perception calculations."""
     id: str
@@ -26,6 +28,23 @@ class PerceptionEntity:
     vision_fov: float = 90.0  # degrees
     vision_height: float = 1.7  # eye height above position
     hearing_range: float = 15.0
+    forward: Optional[Vec3] = None  # None → 360° vision
+    
+    # FOV bounds on the cosine (filled in __post_init__), so most targets
+    # are decided without acos. The margin leaves borderline targets (and
+    # any half FOV outside [0, 180)) to the exact angle test
+    fov_cos_inside: float = field(init=False, repr=False, compare=False)
+    fov_cos_outside: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        half_fov = self.vision_fov / 2
+        if 0.0 <= half_fov < 180.0:
+            cos_half_fov = math.cos(math.radians(half_fov))
+            self.fov_cos_inside = cos_half_fov + 1e-9
+            self.fov_cos_outside = cos_half_fov - 1e-9
+        else:
+            self.fov_cos_inside = math.inf
+            self.fov_cos_outside = -math.inf
 
 
 @dataclass
@@ -36,9 +55,11 @@ class PerceptionWorld:
     targets: Dict[str, PerceptionEntity] = field(default_factory=dict)
     
     obstacles: List[Tuple[Vec3, float]] = field(default_factory=list)
+    # obstacles flattened by _obstacle_table, built once per tick
+    obstacle_table: List[Tuple[float, float, float, float, float]] = field(default_factory=list)
     sound_events: List[Dict[str, Any]] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     """Memory of a perceived entity."""
     entity_id: str
@@ -147,39 +168,130 @@ def line_of_sight(start: Vec3, end: Vec3, obstacles: List[Tuple[Vec3, float]]) -
     Check if there's clear line of sight between two points.
     Simplified: checks if line segment intersects any obstacle sphere.
     """
-    if start == end:
-        return True
+    return line_of_sight_batch(start, [end], obstacles)[0]
+
+
+def _obstacle_table(
+    obstacles: List[Tuple[Vec3, float]],
+) -> List[Tuple[float, float, float, float, float]]:
+    """Obstacles flattened to (cx, cy, cz, |radius|, radius²)."""
+    return [
+        (center[0], center[1], center[2], abs(radius), radius * radius)
+        for center, radius in obstacles
+    ]
+
+
+def line_of_sight_batch(
+    start: Vec3,
+    ends: List[Vec3],
+    obstacles: List[Tuple[Vec3, float]],
+    obstacle_table: Optional[List[Tuple[float, float, float, float, float]]] = None,
+) -> List[bool]:
+    """
+    Line of sight from one point to many (e.g. a perceiver's eye to each
+    candidate target). Same answers as line_of_sight per end; the terms
+    that depend only on start and an obstacle are computed once per batch.
+    Callers running many batches against the same obstacles can pass
+    _obstacle_table(obstacles) to share the flattening.
+    """
+    if obstacle_table is None:
+        obstacle_table = _obstacle_table(obstacles)
     
-    dir_vec = vector_sub(end, start)
-    dist = vector_length(dir_vec)
+    sx, sy, sz = start
     
-    if dist == 0:
-        return True
+    # Ray setup: (unit direction, length) per end, None for a zero-length
+    # ray, which is always clear
+    rays = []
+    for end in ends:
+        if start == end:
+            rays.append(None)
+            continue
+        
+        vx = end[0] - sx
+        vy = end[1] - sy
+        vz = end[2] - sz
+        dist = math.sqrt(vx*vx + vy*vy + vz*vz)
+        
+        if dist == 0:
+            rays.append(None)
+            continue
+        
+        # Unit ray direction; the vector helpers are inlined with the same
+        # operation order, so results match them bit for bit
+        rays.append((vx / dist, vy / dist, vz / dist, dist))
     
-    dir_norm = vector_normalize(dir_vec)
+    return _sweep_rays(start, rays, obstacle_table)
+
+
+def _sweep_rays(
+    start: Vec3,
+    rays: List[Optional[Tuple[float, float, float, float]]],
+    obstacle_table: List[Tuple[float, float, float, float, float]],
+) -> List[bool]:
+    """
+    Obstacle sweep for rays sharing one start, each given as
+    (unit direction, length) or None for a zero-length ray (always
+    clear). True per ray when no obstacle blocks it.
+    """
+    sx, sy, sz = start
+    
+    # Longest ray, known before the obstacles are culled
+    reach = 0.0
+    for ray in rays:
+        if ray is not None and ray[3] > reach:
+            reach = ray[3]
     
-    # Check each obstacle
-    for center, radius in obstacles:
-        # Vector from start to sphere center
-        oc = vector_sub(start, center)
+    # Per obstacle: vector from its center to start and the quadratic
+    # 'c' term, neither of which depends on the ray direction.
+    # Broadphase: a segment no longer than reach can only cross a sphere
+    # whose center is within reach + radius of start, so the rest are
+    # dropped for the whole batch (the relative margin keeps the cull
+    # conservative under rounding)
+    obstacle_terms = []
+    for cx, cy, cz, radius_abs, radius_sq in obstacle_table:
+        ox = sx - cx
+        oy = sy - cy
+        oz = sz - cz
+        center_sq = ox*ox + oy*oy + oz*oz
+        limit = (reach + radius_abs) * (1.0 + 1e-6)
+        if center_sq > limit * limit:
+            continue
+        obstacle_terms.append((ox, oy, oz, center_sq - radius_sq))
+    
+    results = []
+    for ray in rays:
+        if ray is None:
+            results.append(True)
+            continue
         
-        # Quadratic coefficients for ray-sphere intersection
-        a = vector_dot(dir_norm, dir_norm)
-        b = 2.0 * vector_dot(oc, dir_norm)
-        c = vector_dot(oc, oc) - radius * radius
+        nx, ny, nz, dist = ray
         
-        discriminant = b * b - 4 * a * c
+        # Quadratic 'a' term depends only on the ray
+        a = nx*nx + ny*ny + nz*nz
+        two_a = 2 * a
+        four_a = 4 * a
         
-        if discriminant >= 0:
-            sqrt_disc = math.sqrt(discriminant)
-            t1 = (-b - sqrt_disc) / (2 * a)
-            t2 = (-b + sqrt_disc) / (2 * a)
+        # Check each obstacle
+        clear = True
+        for ox, oy, oz, c in obstacle_terms:
+            # Quadratic 'b' coefficient for ray-sphere intersection
+            b = 2.0 * (ox*nx + oy*ny + oz*nz)
             
-            # Check if intersection is between start and end
-            if (0 <= t1 <= dist) or (0 <= t2 <= dist):
-                return False
+            discriminant = b * b - four_a * c
+            
+            if discriminant >= 0:
+                sqrt_disc = math.sqrt(discriminant)
+                t1 = (-b - sqrt_disc) / two_a
+                t2 = (-b + sqrt_disc) / two_a
+                
+                # Check if intersection is between start and end
+                if (0 <= t1 <= dist) or (0 <= t2 <= dist):
+                    clear = False
+                    break
+        
+        results.append(clear)
     
-    return True
+    return results
 
 
 # ===== MAIN KERNEL FUNCTION =====
@@ -189,6 +301,7 @@ def step_perception(
     perception_state: Dict[str, Any],
     current_tick: int,
     sound_events: List[Dict[str, Any]] = None,
+    executor: Optional[Executor] = None,
 ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Pure functional perception kernel.
@@ -198,6 +311,8 @@ def step_perception(
         perception_state: Current perception state
         current_tick: Current simulation tick
         sound_events: Sound events from audio system
+        executor: Optional executor to fan perceivers out over (only pays
+            off when the interpreter can run them without the GIL)
         
     Returns:
         new_perception_state: Updated perception state
@@ -219,125 +334,26 @@ def step_perception(
         state.visible_now.clear()
         state.audible_now.clear()
     
-    # Process each perceiver
-    for perceiver_id, state in states.items():
-        if perceiver_id not in world.entities:
-            continue
-        
-        perceiver = world.entities[perceiver_id]
-        
-        # Vision checks
-        for target_id, target in world.entities.items():
-            if target_id == perceiver_id:
-                continue
-            
-            # Check if target can be seen
-            visible, certainty = _check_visibility(perceiver, target, world.obstacles)
-            
-            if visible:
-                state.visible_now.add(target_id)
-                
-                # Update or create memory
-                if target_id in state.memories:
-                    mem = state.memories[target_id]
-                    mem.last_seen_tick = current_tick
-                    mem.last_known_pos = target.pos
-                    mem.certainty = max(mem.certainty, certainty)
-                else:
-                    state.memories[target_id] = MemoryEntry(
-                        entity_id=target_id,
-                        last_seen_tick=current_tick,
-                        last_known_pos=target.pos,
-                        certainty=certainty,
-                    )
-                
-                # Check if this is newly visible
-                was_visible = target_id in perception_state.get(perceiver_id, {}).get("visible_now", [])
-                if not was_visible:
-                    deltas.append(PerceptionDelta(
-                        type="see",
-                        perceiver_id=perceiver_id,
-                        target_id=target_id,
-                        tick=current_tick,
-                        data={
-                            "certainty": certainty,
-                            "distance": distance(perceiver.pos, target.pos),
-                        }
-                    ))
-            else:
-                # Check if just lost sight
-                was_visible = target_id in perception_state.get(perceiver_id, {}).get("visible_now", [])
-                if was_visible:
-                    deltas.append(PerceptionDelta(
-                        type="lose_sight",
-                        perceiver_id=perceiver_id,
-                        target_id=target_id,
-                        tick=current_tick,
-                        data={
-                            "last_known_pos": list(target.pos),
-                        }
-                    ))
-        
-        # Hearing checks (simplified)
-        for sound in world.sound_events:
-            sound_pos = tuple(sound.get("pos", (0, 0, 0)))
-            volume = sound.get("volume", 1.0)
-            source_id = sound.get("source_id")
-            
-            # Check distance
-            dist = distance(perceiver.pos, sound_pos)
-            if dist <= perceiver.hearing_range:
-                # Simple attenuation
-                audible_volume = volume * (1.0 - (dist / perceiver.hearing_range))
-                
-                if audible_volume > 0.1:  # Hearing threshold
-                    if source_id:
-                        state.audible_now.add(source_id)
-                        
-                        # Update memory for source
-                        if source_id in state.memories:
-                            mem = state.memories[source_id]
-                            mem.last_heard_tick = current_tick
-                            # Update position if we can't see them
-                            if current_tick - mem.last_seen_tick > 10:
-                                mem.last_known_pos = sound_pos
-                                mem.certainty = max(mem.certainty, audible_volume)
-                        elif source_id in world.entities:
-                            state.memories[source_id] = MemoryEntry(
-                                entity_id=source_id,
-                                last_heard_tick=current_tick,
-                                last_known_pos=sound_pos,
-                                certainty=audible_volume,
-                            )
-                        
-                        deltas.append(PerceptionDelta(
-                            type="hear",
-                            perceiver_id=perceiver_id,
-                            target_id=source_id,
-                            tick=current_tick,
-                            data={
-                                "volume": audible_volume,
-                                "sound_type": sound.get("type", "unknown"),
-                            }
-                        ))
-        
-        # Memory decay
-        to_remove = []
-        for target_id, memory in state.memories.items():
-            ticks_since_seen = current_tick - memory.last_seen_tick
-            ticks_since_heard = current_tick - memory.last_heard_tick
-            
-            if ticks_since_seen > 100 and ticks_since_heard > 100:  # Decay threshold
-                to_remove.append(target_id)
-        
-        for target_id in to_remove:
-            del state.memories[target_id]
-            alerts.append(PerceptionAlert(
-                level="INFO",
-                code="MEMORY_FORGOTTEN",
-                message=f"{perceiver_id} forgot about {target_id}",
-                entity_ids=(perceiver_id, target_id),
-            ))
+    # Process each perceiver. Perceivers only write their own state, so
+    # with an executor the per-perceiver passes can run concurrently;
+    # results are merged back in perceiver order either way
+    jobs = [
+        (perceiver_id, state)
+        for perceiver_id, state in states.items()
+        if perceiver_id in world.entities
+    ]
+    
+    def run_perceiver(job):
+        return _step_perceiver(job[0], job[1], world, perception_state, current_tick)
+    
+    if executor is not None and len(jobs) > 1:
+        outcomes = executor.map(run_perceiver, jobs)
+    else:
+        outcomes = map(run_perceiver, jobs)
+    
+    for perceiver_deltas, perceiver_alerts in outcomes:
+        deltas.extend(perceiver_deltas)
+        alerts.extend(perceiver_alerts)
     
     # Convert to output format
     new_state = _to_output_state(states)
@@ -357,6 +373,151 @@ def step_perception(
 
 # ===== HELPER FUNCTIONS =====
 
+def _step_perceiver(
+    perceiver_id: str,
+    state: PerceptionState,
+    world: PerceptionWorld,
+    perception_state: Dict[str, Any],
+    current_tick: int,
+) -> Tuple[List[PerceptionDelta], List[PerceptionAlert]]:
+    """
+    Vision, hearing and memory decay for one perceiver.
+    Updates only this perceiver's state; returns its deltas and alerts.
+    """
+    deltas: List[PerceptionDelta] = []
+    alerts: List[PerceptionAlert] = []
+    
+    perceiver = world.entities[perceiver_id]
+    
+    # What this perceiver saw last tick, as a set for per-target lookups
+    was_visible_ids = set(perception_state.get(perceiver_id, {}).get("visible_now", []))
+    
+    # Vision checks: range, FOV and line of sight for every target in
+    # one pass per perceiver
+    targets = [
+        (target_id, target)
+        for target_id, target in world.entities.items()
+        if target_id != perceiver_id
+    ]
+    sight_dists = _visible_targets(
+        perceiver,
+        [target for _, target in targets],
+        world.obstacle_table,
+    )
+    
+    for (target_id, target), sight_dist in zip(targets, sight_dists):
+        visible = sight_dist is not None
+        
+        if visible:
+            # Certainty falls off with distance
+            certainty = max(0.1, 1.0 - (sight_dist / perceiver.vision_range))
+            state.visible_now.add(target_id)
+            
+            # Update or create memory
+            if target_id in state.memories:
+                mem = state.memories[target_id]
+                mem.last_seen_tick = current_tick
+                mem.last_known_pos = target.pos
+                mem.certainty = max(mem.certainty, certainty)
+            else:
+                state.memories[target_id] = MemoryEntry(
+                    entity_id=target_id,
+                    last_seen_tick=current_tick,
+                    last_known_pos=target.pos,
+                    certainty=certainty,
+                )
+            
+            # Check if this is newly visible
+            was_visible = target_id in was_visible_ids
+            if not was_visible:
+                deltas.append(PerceptionDelta(
+                    type="see",
+                    perceiver_id=perceiver_id,
+                    target_id=target_id,
+                    tick=current_tick,
+                    data={
+                        "certainty": certainty,
+                        "distance": distance(perceiver.pos, target.pos),
+                    }
+                ))
+        else:
+            # Check if just lost sight
+            was_visible = target_id in was_visible_ids
+            if was_visible:
+                deltas.append(PerceptionDelta(
+                    type="lose_sight",
+                    perceiver_id=perceiver_id,
+                    target_id=target_id,
+                    tick=current_tick,
+                    data={
+                        "last_known_pos": list(target.pos),
+                    }
+                ))
+    
+    # Hearing checks (simplified)
+    for sound in world.sound_events:
+        sound_pos = tuple(sound.get("pos", (0, 0, 0)))
+        volume = sound.get("volume", 1.0)
+        source_id = sound.get("source_id")
+        
+        # Check distance
+        dist = distance(perceiver.pos, sound_pos)
+        if dist <= perceiver.hearing_range:
+            # Simple attenuation
+            audible_volume = volume * (1.0 - (dist / perceiver.hearing_range))
+            
+            if audible_volume > 0.1:  # Hearing threshold
+                if source_id:
+                    state.audible_now.add(source_id)
+                    
+                    # Update memory for source
+                    if source_id in state.memories:
+                        mem = state.memories[source_id]
+                        mem.last_heard_tick = current_tick
+                        # Update position if we can't see them
+                        if current_tick - mem.last_seen_tick > 10:
+                            mem.last_known_pos = sound_pos
+                            mem.certainty = max(mem.certainty, audible_volume)
+                    elif source_id in world.entities:
+                        state.memories[source_id] = MemoryEntry(
+                            entity_id=source_id,
+                            last_heard_tick=current_tick,
+                            last_known_pos=sound_pos,
+                            certainty=audible_volume,
+                        )
+                    
+                    deltas.append(PerceptionDelta(
+                        type="hear",
+                        perceiver_id=perceiver_id,
+                        target_id=source_id,
+                        tick=current_tick,
+                        data={
+                            "volume": audible_volume,
+                            "sound_type": sound.get("type", "unknown"),
+                        }
+                    ))
+    
+    # Memory decay
+    to_remove = []
+    for target_id, memory in state.memories.items():
+        ticks_since_seen = current_tick - memory.last_seen_tick
+        ticks_since_heard = current_tick - memory.last_heard_tick
+        
+        if ticks_since_seen > 100 and ticks_since_heard > 100:  # Decay threshold
+            to_remove.append(target_id)
+    
+    for target_id in to_remove:
+        del state.memories[target_id]
+        alerts.append(PerceptionAlert(
+            level="INFO",
+            code="MEMORY_FORGOTTEN",
+            message=f"{perceiver_id} forgot about {target_id}",
+            entity_ids=(perceiver_id, target_id),
+        ))
+    
+    return deltas, alerts
+
+
 def _parse_world(spatial_state: Dict[str, Any], sound_events: List[Dict[str, Any]]) -> PerceptionWorld:
     """Parse spatial state into perception world."""
     world = PerceptionWorld(sound_events=sound_events)
@@ -364,6 +525,10 @@ def _parse_world(spatial_state: Dict[str, Any], sound_events: List[Dict[str, Any
     entities_data = spatial_state.get("spatial3d", {}).get("entities", {})
     
     for eid, data in entities_data.items():
+        # Interned so the per-tick lookups keyed by perceiver/target id
+        # (entities, memories) match by identity
+        eid = sys.intern(eid)
+        
         # Create entity
         entity = PerceptionEntity(
             id=eid,
@@ -379,15 +544,20 @@ def _parse_world(spatial_state: Dict[str, Any], sound_events: List[Dict[str, Any
         
         world.entities[eid] = entity
 
-        # Classify entity roles
-        if "perceiver" in data.get("tags", []):
+        # Classify entity roles (the entity's fields already hold the
+        # parsed values; no second lookup or pos tuple)
+        tags = entity.tags
+        if "perceiver" in tags:
             world.perceivers[eid] = entity
         else:
             world.targets[eid] = entity
         
         # Add to obstacles if solid
-        if data.get("solid", True) and "obstacle" in data.get("tags", []):
-            world.obstacles.append((tuple(data["pos"]), data.get("radius", 0.5)))
+        if entity.solid and "obstacle" in tags:
+            world.obstacles.append((entity.pos, entity.radius))
+    
+    # Shared by every perceiver's line-of-sight batch this tick
+    world.obstacle_table = _obstacle_table(world.obstacles)
     
     return world
 
@@ -397,6 +567,7 @@ def _parse_perception_state(perception_state: Dict[str, Any]) -> Dict[str, Perce
     states = {}
     
     for perceiver_id, data in perception_state.items():
+        perceiver_id = sys.intern(perceiver_id)
         state = PerceptionState()
         
         # Parse visible now
@@ -406,6 +577,7 @@ def _parse_perception_state(perception_state: Dict[str, Any]) -> Dict[str, Perce
         # Parse memories
         memories_data = data.get("memories", {})
         for target_id, mem_data in memories_data.items():
+            target_id = sys.intern(target_id)
             state.memories[target_id] = MemoryEntry(
                 entity_id=target_id,
                 last_seen_tick=mem_data.get("last_seen_tick", 0),
@@ -419,53 +591,91 @@ def _parse_perception_state(perception_state: Dict[str, Any]) -> Dict[str, Perce
     return states
 
 
-def _check_visibility(
+def _visible_targets(
     perceiver: PerceptionEntity,
-    target: PerceptionEntity,
-    obstacles: List[Tuple[Vec3, float]],
-) -> Tuple[bool, float]:
+    targets: List[PerceptionEntity],
+    obstacle_table: List[Tuple[float, float, float, float, float]],
+) -> List[Optional[float]]:
     """
-    Check if target is visible to perceiver.
-    Returns (is_visible, certainty).
+    Full visibility test (range, FOV, line of sight) for one perceiver
+    against many targets, in one pass: per target the eye-to-eye distance
+    if visible, else None. The perceiver's own terms are read once, and
+    the range distance doubles as the sight ray's length.
 
     OMNIVISION RULE:
     - If perceiver.forward is None → 360° vision (skip FOV test)
     """
     # Adjust for eye height
-    eye_pos = (
-        perceiver.pos[0],
-        perceiver.pos[1] + perceiver.vision_height,
-        perceiver.pos[2]
-    )
-
-    target_eye_pos = (
-        target.pos[0],
-        target.pos[1] + perceiver.vision_height,
-        target.pos[2]
-    )
-
-    # Distance check
-    dist = distance(eye_pos, target_eye_pos)
-    if dist > perceiver.vision_range:
-        return False, 0.0
+    px, py, pz = perceiver.pos
+    vision_height = perceiver.vision_height
+    vision_range = perceiver.vision_range
+    eye_y = py + vision_height
+    forward = perceiver.forward
+    half_fov = perceiver.vision_fov / 2
+
+    if forward is not None:
+        fx, fy, fz = forward
+        forward_len = math.sqrt(fx*fx + fy*fy + fz*fz)
+        cos_inside = perceiver.fov_cos_inside
+        cos_outside = perceiver.fov_cos_outside
+
+    # Squared range for a cheap reject before the sqrt. The small relative
+    # margin keeps it conservative under rounding: anything past it is out
+    # of range for certain, anything inside takes the exact test
+    range_sq = vision_range * vision_range * (1.0 + 1e-12)
+
+    # Range/FOV gate per target; each target in view gets a sight ray
+    # from the eye, swept against the obstacles afterwards as one batch
+    dists = []
+    rays = []
+    for target in targets:
+        tx, ty, tz = target.pos
+        target_eye_y = ty + vision_height
+
+        # Distance check (inlined distance())
+        dx = px - tx
+        dy = eye_y - target_eye_y
+        dz = pz - tz
+        dist_sq = dx*dx + dy*dy + dz*dz
+        if dist_sq > range_sq:
+            dists.append(None)
+            continue
+        dist = math.sqrt(dist_sq)
+        if dist > vision_range:
+            dists.append(None)
+            continue
 
-    # FOV check — only when perceiver.forward exists
-    if getattr(perceiver, "forward", None) is not None:
-        to_target = vector_sub(target_eye_pos, eye_pos)
-        angle = angle_between(perceiver.forward, to_target)
-        if angle > perceiver.vision_fov / 2:
-            return False, 0.0
-    # else → omnivision: skip FOV entirely
+        # FOV check — only when perceiver.forward exists. angle_between()
+        # inlined; the eye-to-eye vector's length is dist
+        if forward is not None:
+            if forward_len == 0 or dist == 0:
+                out_of_fov = 0.0 > half_fov
+            else:
+                cos_angle = (fx*(tx - px) + fy*(target_eye_y - eye_y) + fz*(tz - pz)) / (forward_len * dist)
+                if cos_angle > cos_inside:
+                    out_of_fov = False
+                elif cos_angle < cos_outside:
+                    out_of_fov = True
+                else:
+                    cos_angle = max(-1.0, min(1.0, cos_angle))
+                    out_of_fov = math.degrees(math.acos(cos_angle)) > half_fov
+            if out_of_fov:
+                dists.append(None)
+                continue
+        # else → omnivision: skip FOV entirely
 
-    # Obstacle / LOS check
-    if not line_of_sight(eye_pos, target_eye_pos, obstacles):
-        return False, 0.0
+        dists.append(dist)
 
-    # Certainty calculation
-    certainty = 1.0 - (dist / perceiver.vision_range)
-    certainty = max(0.1, certainty)
+        # Sight ray as line_of_sight_batch would set it up. Its length is
+        # the range distance (the components only differ in sign), and a
+        # zero-length ray is always clear
+        if dist == 0:
+            rays.append(None)
+        else:
+            rays.append(((tx - px) / dist, (target_eye_y - eye_y) / dist, (tz - pz) / dist, dist))
 
-    return True, certainty
+    clear_los = iter(_sweep_rays((px, eye_y, pz), rays, obstacle_table))
+    return [dist if dist is not None and next(clear_los) else None for dist in dists]
 
 
 def _to_output_state(states: Dict[str, PerceptionState]) -> Dict[str, Any]:
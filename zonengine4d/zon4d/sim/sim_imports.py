@@ -5,6 +5,8 @@ import time
 from typing import Dict, List, Tuple, Any, Optional
 
 class Alert:
+    __slots__ = ('level', 'step', 'message', 'tick', 'ts', 'payload')
+
     def __init__(self, level, step, message, tick, ts, payload=None):
         self.level = level
         self.step = step
@@ -23,6 +25,8 @@ class BaseStateView:
         self._state_slice = state_slice
 
 class Delta:
+    __slots__ = ('id', 'type', 'payload', 'tags', 'priority')
+
     def __init__(self, id, type, payload, tags=None, priority=0):
         self.id = id
         self.type = type